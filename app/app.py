@@ -1,203 +1,17 @@
-import json
-from pathlib import Path
-
-import pandas as pd
-import numpy as np
 import streamlit as st
 
-# Try importing joblib, fallback to sklearn.externals.joblib if needed
-try:
-    import joblib
-except ImportError:
-    from sklearn.externals import joblib
-
-# PDF generation imports
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 from datetime import datetime
-import io
 
-st.set_page_config(page_title="Donor Availability Predictor", page_icon="🩸", layout="wide")
+import project_path  # noqa: F401  (puts app_pkg on sys.path)
 
-MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
-MODEL_PATH = MODELS_DIR / "final_model.pkl"
-METRICS_PATH = MODELS_DIR / "metrics.json"
+# Only light modules before login; pandas/sklearn load on the prewarm thread
+from app_pkg.registry import prewarm_live_model
+from app_pkg.telemetry import get_telemetry
 
-@st.cache_resource
-def load_model():
-    if not MODEL_PATH.exists():
-        st.error("Model file not found. Run the notebook to create models/final_model.pkl")
-        st.stop()
-    return joblib.load(MODEL_PATH)
-
-@st.cache_data
-def load_metrics():
-    if METRICS_PATH.exists():
-        return json.loads(METRICS_PATH.read_text())
-    return {"model":"(unknown)","f1_macro":None,"roc_auc":None,"threshold":0.50}
-
-model = load_model()
-metrics = load_metrics()
-
-# Simple local auth helpers (file-based). Not for production.
-USERS_PATH = Path(__file__).resolve().parent / "users.json"
-
-def load_users():
-    if USERS_PATH.exists():
-        try:
-            return json.loads(USERS_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
-
-def save_users(users: dict):
-    USERS_PATH.write_text(json.dumps(users, indent=2))
-
-import hashlib, binascii, secrets
-
-def _hash_password(password: str, salt: bytes = None) -> tuple:
-    if salt is None:
-        salt = secrets.token_bytes(16)
-    pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100_000)
-    return binascii.hexlify(salt).decode(), binascii.hexlify(pwd_hash).decode()
-
-def verify_password(stored_salt_hex: str, stored_hash_hex: str, provided_password: str) -> bool:
-    salt = binascii.unhexlify(stored_salt_hex.encode())
-    _, new_hash = _hash_password(provided_password, salt)
-    return secrets.compare_digest(new_hash, stored_hash_hex)
-
-def create_user(username: str, password: str) -> bool:
-    username = username.strip().lower()
-    if not username or not password:
-        return False
-    users = load_users()
-    if username in users:
-        return False
-    salt_hex, hash_hex = _hash_password(password)
-    users[username] = {"salt": salt_hex, "hash": hash_hex}
-    save_users(users)
-    return True
-
-def generate_prediction_pdf(input_data: dict, prediction_result: dict, username: str) -> bytes:
-    """Generate a PDF report with prediction inputs and outputs"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        textColor=colors.darkblue,
-        alignment=1  # Center alignment
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.darkred
-    )
-    
-    # Title and header
-    story.append(Paragraph("🩸 Donor Availability Prediction Report", title_style))
-    story.append(Spacer(1, 20))
-    
-    # Report info
-    report_info = [
-        ['Report Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-        ['User:', username],
-        ['Prediction ID:', f"PRED-{datetime.now().strftime('%Y%m%d-%H%M%S')}"]
-    ]
-    
-    info_table = Table(report_info, colWidths=[2*inch, 3*inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(info_table)
-    story.append(Spacer(1, 30))
-    
-    # Input Data Section
-    story.append(Paragraph("📋 Input Data", heading_style))
-    
-    input_table_data = [['Field', 'Value']]
-    for key, value in input_data.items():
-        input_table_data.append([key, str(value)])
-    
-    input_table = Table(input_table_data, colWidths=[2.5*inch, 3*inch])
-    input_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ]))
-    
-    story.append(input_table)
-    story.append(Spacer(1, 30))
-    
-    # Prediction Results Section
-    story.append(Paragraph("🎯 Prediction Results", heading_style))
-    
-    result_color = colors.green if prediction_result['decision'] == 'Available (Yes)' else colors.red
-    
-    result_table_data = [
-        ['Metric', 'Value'],
-        ['Availability Probability', f"{prediction_result['probability']:.2f}%"],
-        ['Decision', prediction_result['decision']],
-        ['Model Used', prediction_result['model']]
-    ]
-    
-    result_table = Table(result_table_data, colWidths=[2.5*inch, 3*inch])
-    result_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ('TEXTCOLOR', (1, 2), (1, 2), result_color),  # Color the decision text
-        ('FONTNAME', (1, 2), (1, 2), 'Helvetica-Bold')  # Bold the decision
-    ]))
-    
-    story.append(result_table)
-    story.append(Spacer(1, 30))
-    
-    # Footer
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=1
-    )
-    
-    story.append(Spacer(1, 50))
-    story.append(Paragraph("Generated by Donor Availability Predictor | Powered by Machine Learning", footer_style))
-    story.append(Paragraph("This report is for informational purposes only.", footer_style))
-    
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
+st.set_page_config(page_title="Donor Availability Predictor", page_icon="🩸", layout="wide")
+
+# Keep batch PDF rosters to a printable size
+MAX_BULK_REPORT_ROWS = 2000
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
@@ -206,6 +20,9 @@ if 'logged_in' not in st.session_state:
 
 # Check if user is logged in
 if not st.session_state['logged_in']:
+    # Load and warm the model in the background while the user signs in
+    prewarm_live_model()
+
     st.title("🩸 Donor Availability Predictor")
     st.markdown("### 🔐 Authentication Required")
     st.info("Please sign in to access the Donor Availability Predictor.")
@@ -227,12 +44,104 @@ if not st.session_state['logged_in']:
     # Stop execution here if not logged in
     st.stop()
 
+import io
+import math
+
+import pandas as pd
+
+from app_pkg.batch import score_frame
+from app_pkg.cache import PredictionCache
+from app_pkg.dataset import DEFAULT_CSV, cache_path_for, load_donor_dataset
+from app_pkg.donors import DonorStore
+from app_pkg.fastpath import FastPredictor
+from app_pkg.features import RAW_COLUMNS, derive_record
+from app_pkg.search import COMPATIBLE_DONORS, DonorIndex
+from app_pkg.thresholds import ThresholdTable
+
+@st.cache_resource
+def get_live_model():
+    """Registry-backed model; a background thread swaps in newly promoted versions"""
+    # Usually already loaded by the prewarm started on the sign-in screens. A failed
+    # load raises, so nothing is cached and the next rerun tries again
+    return prewarm_live_model().result().start()
+
+@st.cache_resource
+def load_fast_model(version: str, _model):
+    """Flatten the pipeline into NumPy arrays for single-row scoring (None if unsupported)"""
+    try:
+        return FastPredictor.from_pipeline(_model)
+    except (TypeError, KeyError, AttributeError):
+        return None
+
+@st.cache_resource
+def get_prediction_cache():
+    """One LRU/TTL cache shared across sessions; cleared when the live model changes"""
+    return PredictionCache()
+
+@st.cache_resource
+def get_donor_index(_model, _version):
+    """Built once from the donor table; later model versions and CSV edits are folded in incrementally"""
+    return DonorIndex(load_donor_dataset(), _model, _version, source=cache_path_for(DEFAULT_CSV).name)
+
+@st.cache_resource
+def get_donor_store(source: str):
+    """Compact PII-free donor arrays keyed by donor_id; ``source`` changes when the CSV does"""
+    return DonorStore.load(DEFAULT_CSV)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def score_upload(data: bytes, version: str, _model, _thresholds):
+    """Scored upload and its CSV export, cached per (file bytes, model version) so reruns don't re-score it"""
+    with telemetry.stage("batch.read_csv"):
+        batch_df = pd.read_csv(io.BytesIO(data))
+    with telemetry.stage("batch.score"):
+        # Large uploads fan out over worker processes when the model is expensive enough
+        scored_df, timings = score_frame(_model, batch_df, threshold=_thresholds, workers=None)
+    # score_frame times its own feature derivation and predict_proba passes
+    telemetry.observe("batch.features", timings["feature_seconds"])
+    telemetry.observe("batch.model", timings["predict_seconds"])
+    telemetry.incr("batch_rows_scored", len(scored_df))
+    return scored_df, timings, scored_df.to_csv(index=False).encode("utf-8")
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_roster_pdf(data: bytes, version: str, username: str, model_name: str, _scored_df):
+    """Bulk roster PDF for an upload, built once per (file bytes, model version, user)"""
+    from app_pkg.reports import generate_bulk_pdf
+
+    with telemetry.stage("batch.pdf"):
+        return generate_bulk_pdf(_scored_df.head(MAX_BULK_REPORT_ROWS), username, model_name)
+
+def _prefill_count(record: dict, column: str) -> int:
+    value = record.get(column)
+    return 0 if value is None or math.isnan(value) else max(0, int(value))
+
+# Per-stage latency histograms and counters, shared with the auth pages
+telemetry = get_telemetry()
+
+# Load time is recorded by the LiveModel itself (as "model.load"), once per actual load
+try:
+    live_model = get_live_model()
+except FileNotFoundError:
+    st.error("Model file not found. Run the notebook to create models/final_model.pkl")
+    st.stop()
+except Exception as e:
+    st.error(f"❌ Model failed to load: {e}")
+    st.stop()
+
+# One snapshot per rerun: a model swap mid-script can't mix two versions
+model_snapshot = live_model.get()
+model = model_snapshot.model
+fast_model = load_fast_model(model_snapshot.version, model)
+metrics = {"model": "(unknown)", "f1_macro": None, "roc_auc": None, "threshold": 0.50, **model_snapshot.metrics}
+# Calibrated decision threshold(s) stored with the model (see app_pkg.thresholds)
+thresholds = ThresholdTable.from_metrics(metrics)
+
 # User is logged in - show the main app
 st.sidebar.header("🩸 Enter Donor Specifications")
 
 # Main content area
 st.title("🩸 Donor Availability Predictor")
 st.markdown(f"Welcome back, **{st.session_state['username']}**! Predict donor availability using our ML model.")
+st.caption(f"Model: {metrics.get('model', '(unknown)')} · version {model_snapshot.version}")
 
 # User info and sign out in top right
 col1, col2 = st.columns([4, 1])
@@ -250,69 +159,78 @@ st.markdown("---")
 # Sidebar inputs (only shown when logged in)
 with st.sidebar:
     st.markdown("### Donor Information")
+    # Optionally prefill the form from a registered donor
+    lookup_id = st.text_input("Donor ID (optional)", value="").strip()
+    prefill = {}
+    if lookup_id:
+        with telemetry.stage("donor_lookup"):
+            prefill = get_donor_store(cache_path_for(DEFAULT_CSV).name).record(lookup_id) or {}
+        if not prefill:
+            st.caption(f"No donor with ID {lookup_id}")
     cities = ["", "Adelaide", "Brisbane", "Canberra", "Darwin", "Hobart", "Melbourne", "Perth", "Sydney", "Others"]
-    city = st.selectbox("City", cities, index=0)
+    prefill_city = "Others" if prefill.get("city") == "Unknown" else prefill.get("city")
+    city = st.selectbox("City", cities, index=cities.index(prefill_city) if prefill_city in cities else 0)
     blood_groups = ["", "A+", "A-", "AB+", "AB-", "B+", "B-", "O+", "O-"]
-    blood_group = st.selectbox("Blood Group", blood_groups, index=0)
+    prefill_group = prefill.get("blood_group")
+    blood_group = st.selectbox("Blood Group", blood_groups,
+                               index=blood_groups.index(prefill_group) if prefill_group in blood_groups else 0)
     
     st.markdown("### Donation History")
-    months_since_first_donation = st.number_input("Months Since First Donation", min_value=0, step=1, value=0)
-    number_of_donation = st.number_input("Number of Donations", min_value=0, step=1, value=0)
-    pints_donated = st.number_input("Pints Donated", min_value=0, step=1, value=0)
+    months_since_first_donation = st.number_input("Months Since First Donation", min_value=0, step=1,
+                                                  value=_prefill_count(prefill, "months_since_first_donation"))
+    number_of_donation = st.number_input("Number of Donations", min_value=0, step=1,
+                                         value=_prefill_count(prefill, "number_of_donation"))
+    pints_donated = st.number_input("Pints Donated", min_value=0, step=1,
+                                    value=_prefill_count(prefill, "pints_donated"))
     
     st.markdown("### Additional Info")
-    created_at = st.date_input("Created Date", value=None)
+    created_at = st.date_input("Created Date", value=prefill.get("created_at"))
     
     st.markdown("---")
     predict_button = st.button("Predict", type="primary", use_container_width=True)
 
 # Main prediction area (only accessible when logged in)
 if predict_button and st.session_state['logged_in']:
-    # Handle date components for the model (simple version to match notebook)
-    if created_at:
-        created_at_ts = pd.Timestamp(created_at)
-        created_at_month = int(created_at_ts.month)
-        created_at_year = int(created_at_ts.year)
-        created_at_day = int(created_at_ts.day)
-    else:
-        created_at_month = None
-        created_at_year = None
-        created_at_day = None
-
     # Map "Others" to "Unknown" for the model
     city_for_model = "Unknown" if city == "Others" else (city or None)
 
-    # Calculate engineered features that the model expects
-    months_val = months_since_first_donation if months_since_first_donation != "" else 1
-    donations_val = number_of_donation if number_of_donation != "" else 1
-    pints_val = pints_donated if pints_donated != "" else 1
-    
-    # Calculate the missing engineered features
-    donations_per_month = donations_val / max(months_val, 1)
-    account_age_months = months_val  # Same as months_since_first_donation
-    age_x_donations = months_val * donations_val
-    pints_per_donation = pints_val / max(donations_val, 1)
-
-    X = pd.DataFrame([{
-        # Basic features
-        "city": city_for_model,
-        "blood_group": blood_group or None,
-        "months_since_first_donation": months_val,
-        "number_of_donation": donations_val,
-        "pints_donated": pints_val,
-        "created_at_year": created_at_year,
-        "created_at_month": created_at_month,
-        "created_at_day": created_at_day,
-        
-        # Engineered features that the model expects
-        "donations_per_month": donations_per_month,
-        "account_age_months": account_age_months,
-        "age_x_donations": age_x_donations,
-        "pints_per_donation": pints_per_donation
-    }])
+    donor_record = {
+        "city": city,
+        "blood_group": blood_group,
+        "months_since_first_donation": months_since_first_donation,
+        "number_of_donation": number_of_donation,
+        "pints_donated": pints_donated,
+        "created_at": created_at,
+    }
     
+    decision_threshold = thresholds.lookup(donor_record)
+
     try:
-        proba = float(model.predict_proba(X)[:,1][0])
+        with telemetry.request("predict"):
+            # Derived once; both the cache key and the model read these features
+            with telemetry.stage("predict.features"):
+                donor_features = derive_record(donor_record)
+            # Re-predicting the same donor profile is served from the cache
+            with telemetry.stage("predict.cache_lookup"):
+                prediction_cache = get_prediction_cache()
+                prediction_cache.bind_model(model_snapshot.model_path, model_snapshot.metrics_path)
+                cache_key = prediction_cache.make_key(features=donor_features)
+                cached = prediction_cache.get(cache_key)
+            if cached is None:
+                telemetry.incr("prediction_cache_misses")
+                with telemetry.stage("predict.model"):
+                    # Fast path skips DataFrame/ColumnTransformer work
+                    if fast_model is not None:
+                        proba = fast_model.predict_proba_features(donor_features)
+                    else:
+                        feature_row = pd.DataFrame([donor_features]).astype({"city": object, "blood_group": object})
+                        proba = float(model.predict_proba(feature_row)[:,1][0])
+                decision = "Available (Yes)" if proba >= decision_threshold else "Not Available (No)"
+                cached = prediction_cache.put(cache_key, proba, decision)
+            else:
+                telemetry.incr("prediction_cache_hits")
+        telemetry.incr("predictions")
+        proba = cached["probability"]
         
         # Display results in a nice format
         st.markdown("## 📊 Prediction Results")
@@ -328,8 +246,8 @@ if predict_button and st.session_state['logged_in']:
         
         with col2:
             # Model predicts probability of "Yes" (Available)
-            # Use the model's probability directly for Yes/No decision
-            if proba >= 0.5:
+            # Compare it with the calibrated threshold for this donor's cohort
+            if proba >= decision_threshold:
                 availability_text = "✅ Available (Yes)"
                 availability_color = "green"
                 decision_result = "Available (Yes)"
@@ -340,6 +258,7 @@ if predict_button and st.session_state['logged_in']:
             
             st.markdown(f"### Decision")
             st.markdown(f"<h3 style='color: {availability_color};'>{availability_text}</h3>", unsafe_allow_html=True)
+            st.caption(f"Decision threshold: {decision_threshold:.3f}")
         
         # Prepare data for PDF
         pdf_input_data = {
@@ -362,7 +281,14 @@ if predict_button and st.session_state['logged_in']:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             try:
-                pdf_data = generate_prediction_pdf(pdf_input_data, pdf_prediction_result, st.session_state['username'])
+                pdf_data = cached["pdf"].get(st.session_state['username'])
+                if pdf_data is None:
+                    with telemetry.stage("predict.pdf"):
+                        # reportlab is only imported once someone actually asks for a PDF
+                        from app_pkg.reports import generate_prediction_pdf
+
+                        pdf_data = generate_prediction_pdf(pdf_input_data, pdf_prediction_result, st.session_state['username'])
+                    prediction_cache.attach_pdf(cached, st.session_state['username'], pdf_data)
                 st.download_button(
                     label="📄 Download PDF Report",
                     data=pdf_data,
@@ -388,6 +314,12 @@ if predict_button and st.session_state['logged_in']:
         
         for key, value in input_data.items():
             st.write(f"**{key}:** {value}")
+        
+        cache_stats = prediction_cache.stats()
+        st.caption(
+            f"Prediction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['entries']} entries, model {cache_stats['model_version']})"
+        )
             
     except Exception as e:
         st.error(f"❌ Prediction failed: {e}")
@@ -404,4 +336,106 @@ else:
     1. **Enter donor information** in the sidebar
     2. **Click Predict** to get the availability probability
     3. **Review the results** including probability and confidence metrics
-    """)
\ No newline at end of file
+    """)
+
+# Donor search: top-k compatible donors for a recipient from precomputed scores
+st.markdown("---")
+st.markdown("## 🔎 Find Compatible Donors")
+col1, col2, col3 = st.columns([2, 2, 1])
+with col1:
+    recipient_group = st.selectbox("Recipient Blood Group", list(COMPATIBLE_DONORS))
+with col2:
+    search_city = st.selectbox("City", ["All cities", "Adelaide", "Brisbane", "Canberra", "Darwin", "Hobart", "Melbourne", "Perth", "Sydney", "Others"])
+with col3:
+    top_k = st.number_input("Donors", min_value=1, max_value=500, value=10, step=1)
+
+if st.button("Find Donors"):
+    try:
+        with telemetry.request("search"):
+            with telemetry.stage("search.refresh"):
+                donor_index = get_donor_index(model, model_snapshot.version)
+                # No-ops unless a new model went live or the donor CSV changed
+                donor_index.rescore(model, model_snapshot.version)
+                # The cache file name changes with the CSV's hash, so an unchanged CSV costs one stat()
+                sync_stats = donor_index.refresh(cache_path_for(DEFAULT_CSV).name, load_donor_dataset)
+            with telemetry.stage("search.query"):
+                matches = donor_index.query(
+                    recipient_group,
+                    None if search_city == "All cities" else search_city,
+                    int(top_k)
+                )
+        telemetry.incr("searches")
+        st.markdown(f"Donors compatible with **{recipient_group}**: {', '.join(COMPATIBLE_DONORS[recipient_group])}")
+        st.dataframe(matches, use_container_width=True)
+        st.caption(
+            f"Index: {len(donor_index):,} donors scored with model {donor_index.version} · "
+            f"{sync_stats['rescored']:,} re-scored on refresh"
+        )
+    except Exception as e:
+        st.error(f"❌ Donor search failed: {e}")
+
+# Batch scoring: score a whole donor CSV in one vectorized pass
+st.markdown("---")
+st.markdown("## 📂 Batch Scoring")
+st.markdown(f"Upload a CSV with the columns: `{', '.join(RAW_COLUMNS)}`")
+uploaded_file = st.file_uploader("Donor CSV", type=["csv"])
+
+if uploaded_file is not None:
+    try:
+        upload_bytes = uploaded_file.getvalue()
+        with telemetry.request("batch"):
+            scored_df, timings, scored_csv = score_upload(upload_bytes, model_snapshot.version, model, thresholds)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows Scored", f"{timings['rows']:,}")
+        col2.metric("Total Time", f"{timings['total_seconds']:.2f}s")
+        col3.metric("Rows / Second", f"{timings['rows_per_second']:,.0f}")
+        st.caption(
+            f"Features: {timings['feature_seconds']:.3f}s | "
+            f"predict_proba: {timings['predict_seconds']:.3f}s | "
+            f"workers: {timings['workers']}"
+        )
+
+        st.dataframe(scored_df.head(100), use_container_width=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Download Scored CSV",
+                data=scored_csv,
+                file_name=f"scored_donors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+        with col2:
+            if len(scored_df) > MAX_BULK_REPORT_ROWS:
+                st.caption(f"PDF roster covers the first {MAX_BULK_REPORT_ROWS:,} donors; use the CSV for the full batch.")
+            roster_pdf = build_roster_pdf(
+                upload_bytes,
+                model_snapshot.version,
+                st.session_state['username'],
+                metrics.get('model', '(unknown)'),
+                scored_df
+            )
+            st.download_button(
+                label="📄 Download PDF Roster",
+                data=roster_pdf,
+                file_name=f"donor_roster_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+    except Exception as e:
+        st.error(f"❌ Batch scoring failed: {e}")
+
+# Per-stage latency (p50/p95/p99) and counters since the server started
+st.markdown("---")
+with st.expander("📟 Performance"):
+    telemetry_snapshot = telemetry.snapshot()
+    if telemetry_snapshot["stages"]:
+        st.dataframe(pd.DataFrame(telemetry_snapshot["stages"]).T, use_container_width=True)
+    st.json({"counters": telemetry_snapshot["counters"], "errors": telemetry_snapshot["errors"]})
+    st.download_button(
+        label="📥 Prometheus Metrics",
+        data=telemetry.prometheus_text(),
+        file_name="donor_app_metrics.prom",
+        mime="text/plain"
+    )
@@ -0,0 +1,71 @@
+import streamlit as st
+
+import project_path  # noqa: F401  (puts app_pkg on sys.path)
+
+from app_pkg.analytics import CohortStore
+
+st.set_page_config(page_title="Analytics - Donor Availability Predictor", page_icon="📈", layout="wide")
+
+@st.cache_resource
+def get_cohort_store():
+    """City x blood group x month running sums; only rows appended to the CSV are parsed on refresh"""
+    return CohortStore()
+
+# Initialize session state
+if 'logged_in' not in st.session_state:
+    st.session_state['logged_in'] = False
+    st.session_state['username'] = None
+
+st.title("📈 Cohort Analytics")
+
+if not st.session_state['logged_in']:
+    st.info("Please sign in to view donor analytics.")
+    if st.button("🔐 Sign In", type="primary"):
+        st.switch_page("pages/Sign_In.py")
+    st.stop()
+
+store = get_cohort_store()
+refresh_stats = store.refresh()
+
+all_sums = store.sums.reset_index()
+months = sorted(m for m in all_sums["month"].unique() if m != "Unknown")
+
+with st.sidebar:
+    st.markdown("### Filters")
+    cities = st.multiselect("City", sorted(all_sums["city"].unique()))
+    blood_groups = st.multiselect("Blood Group", sorted(all_sums["blood_group"].unique()))
+    month_range = st.select_slider("Created", options=months, value=(months[0], months[-1])) if months else None
+
+filters = {"cities": cities, "blood_groups": blood_groups, "months": month_range}
+totals = store.rollup([], **filters).iloc[0]
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Donors", f"{int(totals['donors']):,}")
+col2.metric("Availability Rate", f"{totals['availability_rate'] * 100:.1f}%" if totals['labelled'] else "n/a")
+col3.metric("Donations", f"{int(totals['donations']):,}")
+col4.metric("Pints", f"{int(totals['pints']):,}")
+
+st.markdown("---")
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("### Availability Rate by Blood Group")
+    st.bar_chart(store.rollup(["blood_group"], **filters)["availability_rate"].sort_values())
+with col2:
+    st.markdown("### Availability Rate by City")
+    st.bar_chart(store.rollup(["city"], **filters)["availability_rate"].sort_values())
+
+st.markdown("### City × Blood Group")
+by_cohort = store.rollup(["city", "blood_group"], **filters)
+metric = st.radio("Show", ["availability_rate", "donors", "donations", "pints"], horizontal=True)
+st.dataframe(by_cohort[metric].unstack("blood_group"), use_container_width=True)
+
+st.markdown("### By Month")
+by_month = store.rollup(["month"], **filters).drop(index="Unknown", errors="ignore")
+st.line_chart(by_month[["availability_rate"]])
+st.bar_chart(by_month[["donations", "pints"]])
+
+st.caption(
+    f"{len(store.sums):,} cohorts over {refresh_stats['rows']:,} donor rows · "
+    f"refresh: {refresh_stats['mode']}, {refresh_stats['rows_added']:,} rows added "
+    f"in {refresh_stats['seconds'] * 1000:.0f} ms"
+)
@@ -1,34 +1,21 @@
 import streamlit as st
-import json
-from pathlib import Path
-import hashlib
-import binascii
-import secrets
 
-st.set_page_config(page_title="Sign In - Donor Availability Predictor", page_icon="🔐", layout="centered")
-
-# Auth helpers
-USERS_PATH = Path(__file__).resolve().parent.parent / "users.json"
+import project_path  # noqa: F401  (puts app_pkg on sys.path)
 
-def load_users():
-    if USERS_PATH.exists():
-        try:
-            return json.loads(USERS_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
+from app_pkg.auth import get_auth_service, normalize_username
+from app_pkg.registry import prewarm_live_model
+from app_pkg.telemetry import get_telemetry
 
-def verify_password(stored_salt_hex: str, stored_hash_hex: str, provided_password: str) -> bool:
-    salt = binascii.unhexlify(stored_salt_hex.encode())
-    pwd_hash = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt, 100_000)
-    new_hash = binascii.hexlify(pwd_hash).decode()
-    return secrets.compare_digest(new_hash, stored_hash_hex)
+st.set_page_config(page_title="Sign In - Donor Availability Predictor", page_icon="🔐", layout="centered")
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
     st.session_state['logged_in'] = False
     st.session_state['username'] = None
 
+# Start loading the model now so the main app is ready right after sign-in
+prewarm_live_model()
+
 # Main sign-in page
 st.title("🔐 Sign In")
 st.markdown("Welcome back! Please sign in to access the Donor Availability Predictor.")
@@ -46,20 +33,20 @@ if not st.session_state['logged_in']:
         
         if submit:
             if username and password:
-                users = load_users()
-                username_lower = username.strip().lower()
+                username_lower = normalize_username(username)
                 
-                if username_lower in users:
-                    user_data = users[username_lower]
-                    if verify_password(user_data['salt'], user_data['hash'], password):
-                        st.session_state['logged_in'] = True
-                        st.session_state['username'] = username_lower
-                        st.success("Successfully signed in!")
-                        st.info("Redirecting to the main app...")
-                        # Redirect to main page
-                        st.switch_page("app.py")
-                    else:
-                        st.error("❌ Invalid username or password")
+                telemetry = get_telemetry()
+                with telemetry.request("auth.sign_in"):
+                    authenticated = get_auth_service().authenticate(username_lower, password)
+                telemetry.incr("sign_ins" if authenticated else "sign_in_failures")
+
+                if authenticated:
+                    st.session_state['logged_in'] = True
+                    st.session_state['username'] = username_lower
+                    st.success("Successfully signed in!")
+                    st.info("Redirecting to the main app...")
+                    # Redirect to main page
+                    st.switch_page("app.py")
                 else:
                     st.error("❌ Invalid username or password")
             else:
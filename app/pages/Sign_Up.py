@@ -1,43 +1,15 @@
 import streamlit as st
-import json
-from pathlib import Path
-import hashlib
-import binascii
-import secrets
 
-st.set_page_config(page_title="Sign Up - Donor Availability Predictor", page_icon="📝", layout="centered")
-
-# Auth helpers
-USERS_PATH = Path(__file__).resolve().parent.parent / "users.json"
-
-def load_users():
-    if USERS_PATH.exists():
-        try:
-            return json.loads(USERS_PATH.read_text())
-        except Exception:
-            return {}
-    return {}
+import project_path  # noqa: F401  (puts app_pkg on sys.path)
 
-def save_users(users: dict):
-    USERS_PATH.write_text(json.dumps(users, indent=2))
+from app_pkg.auth import get_auth_service
+from app_pkg.registry import prewarm_live_model
+from app_pkg.telemetry import get_telemetry
 
-def _hash_password(password: str, salt: bytes = None) -> tuple:
-    if salt is None:
-        salt = secrets.token_bytes(16)
-    pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100_000)
-    return binascii.hexlify(salt).decode(), binascii.hexlify(pwd_hash).decode()
+st.set_page_config(page_title="Sign Up - Donor Availability Predictor", page_icon="📝", layout="centered")
 
-def create_user(username: str, password: str) -> bool:
-    username = username.strip().lower()
-    if not username or not password:
-        return False
-    users = load_users()
-    if username in users:
-        return False
-    salt_hex, hash_hex = _hash_password(password)
-    users[username] = {"salt": salt_hex, "hash": hash_hex}
-    save_users(users)
-    return True
+# Start loading the model now so the main app is ready right after sign-up
+prewarm_live_model()
 
 # Main sign-up page
 st.title("📝 Create Account")
@@ -69,7 +41,12 @@ with st.form("signup_form"):
         elif len(username.strip()) < 3:
             st.error("❌ Username must be at least 3 characters long")
         else:
-            if create_user(username, password):
+            telemetry = get_telemetry()
+            with telemetry.request("auth.sign_up"):
+                created = get_auth_service().create_user(username, password)
+            telemetry.incr("sign_ups" if created else "sign_up_conflicts")
+
+            if created:
                 st.success("🎉 Account created successfully!")
                 st.info("You can now sign in with your new account.")
             else:
@@ -0,0 +1,11 @@
+"""Put the project root on ``sys.path`` so ``app_pkg`` imports from every page.
+
+``streamlit run app/app.py`` adds ``app/`` to ``sys.path``, so ``app.py`` and
+the scripts under ``pages/`` can all ``import project_path`` first.
+"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
@@ -0,0 +1,208 @@
+"""Precomputed cohort aggregates for the analytics page.
+
+Keeps running sums (donors, labelled rows, available donors, donations,
+pints) per city x blood group x month in a small table under
+``data/.cache/``. When the donor CSV only grew, ``refresh`` parses just the
+appended bytes and adds their sums; any other edit triggers one rebuild.
+"Only grew" is checked against the size and a hash of the first and last
+``EDGE_BYTES`` already folded in, so the check costs the same however big
+the file gets; an in-place edit further from both ends needs ``--rebuild``.
+Rates are derived from the sums at query time, so rollups never touch the
+donor rows.
+
+    python -m app_pkg.analytics                 # refresh + availability rate by city x blood group
+    python -m app_pkg.analytics --by month
+    python -m app_pkg.analytics --rebuild       # re-parse the whole CSV
+"""
+import argparse
+import hashlib
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app_pkg.dataset import CACHE_DIR, DEFAULT_CSV
+from app_pkg.paths import atomic_write
+
+KEYS = ["city", "blood_group", "month"]
+SUM_COLUMNS = ["donors", "labelled", "available", "donations", "pints"]
+COUNT_DTYPES = {"donors": "int64", "labelled": "int64", "available": "int64", "donations": "float64", "pints": "float64"}
+# Same "yes" spellings the notebook counts when computing availability rates
+AVAILABLE_VALUES = ["yes", "y", "true", "1"]
+UNKNOWN = "Unknown"
+# Bytes hashed at each end of the already-parsed prefix to detect edits
+EDGE_BYTES = 64 * 1024
+
+
+def cohort_sums(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-cohort sums for a batch of raw donor rows, indexed by ``KEYS``"""
+    target = df["availability"].astype(object) if "availability" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    labelled = target.notna()
+    frame = pd.DataFrame({
+        "city": df["city"].astype(object).replace({"Others": UNKNOWN, "": UNKNOWN}).fillna(UNKNOWN),
+        "blood_group": df["blood_group"].astype(object).replace({"": UNKNOWN}).fillna(UNKNOWN),
+        "month": pd.to_datetime(df["created_at"], errors="coerce", format="ISO8601").dt.strftime("%Y-%m").fillna(UNKNOWN),
+        "donors": 1,
+        "labelled": labelled.astype("int64"),
+        "available": (labelled & target.astype(str).str.strip().str.lower().isin(AVAILABLE_VALUES)).astype("int64"),
+        "donations": pd.to_numeric(df["number_of_donation"], errors="coerce").fillna(0.0),
+        "pints": pd.to_numeric(df["pints_donated"], errors="coerce").fillna(0.0),
+    })
+    return frame.groupby(KEYS, sort=False)[SUM_COLUMNS].sum()
+
+
+def add_rates(sums: pd.DataFrame) -> pd.DataFrame:
+    """Availability rate and per-donor averages from summed columns"""
+    out = sums.copy()
+    out["availability_rate"] = out["available"] / out["labelled"].where(out["labelled"] > 0)
+    out["donations_per_donor"] = out["donations"] / out["donors"]
+    out["pints_per_donor"] = out["pints"] / out["donors"]
+    return out
+
+
+def _edge_sha256(f, end: int) -> str:
+    """SHA-256 of the first and last ``EDGE_BYTES`` of ``f[:end]``"""
+    digest = hashlib.sha256()
+    f.seek(0)
+    digest.update(f.read(min(EDGE_BYTES, end)))
+    start = max(EDGE_BYTES, end - EDGE_BYTES)
+    f.seek(start)
+    digest.update(f.read(max(0, end - start)))
+    return digest.hexdigest()
+
+
+class CohortStore:
+    """Running city x blood group x month sums for one donor CSV, persisted next to the dataset cache"""
+
+    def __init__(self, csv_path=DEFAULT_CSV, cache_dir: Path = CACHE_DIR, chunk_size: int = 100_000):
+        self.csv_path = Path(csv_path)
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.table_path = self.cache_dir / f"{self.csv_path.stem}.cohorts.csv"
+        self.state_path = self.cache_dir / f"{self.csv_path.stem}.cohorts.json"
+        self.state = self._read_state()
+        self.sums = self._read_table() if self.state else self._empty()
+
+    @staticmethod
+    def _empty() -> pd.DataFrame:
+        return pd.DataFrame(columns=KEYS + SUM_COLUMNS).astype(COUNT_DTYPES).set_index(KEYS)
+
+    def _read_state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _read_table(self) -> pd.DataFrame:
+        try:
+            return pd.read_csv(self.table_path, dtype={k: str for k in KEYS}, keep_default_na=False).set_index(KEYS)
+        except (OSError, ValueError):
+            self.state = {}
+            return self._empty()
+
+    def add(self, df: pd.DataFrame):
+        """Fold new donor rows into the running sums"""
+        if len(df):
+            batch = cohort_sums(df)
+            sums = batch.add(self.sums, fill_value=0) if len(self.sums) else batch
+            self.sums = sums.astype(COUNT_DTYPES)
+
+    def refresh(self, rebuild: bool = False) -> dict:
+        """Bring the sums up to date with the CSV; returns how much work that took"""
+        with self._lock:
+            return self._refresh(rebuild)
+
+    def _refresh(self, rebuild: bool = False) -> dict:
+        t0 = time.perf_counter()
+        stat = self.csv_path.stat()
+        offset = self.state.get("offset", 0)
+        if (not rebuild and self.state and stat.st_size == offset
+                and stat.st_mtime_ns == self.state.get("mtime_ns")):
+            return {"mode": "cached", "rows_added": 0, "rows": self.state["rows"], "seconds": time.perf_counter() - t0}
+
+        with open(self.csv_path, "rb") as f:
+            # Appended-to file: the ends of the bytes already folded in must be unchanged
+            append = (not rebuild and bool(self.state) and stat.st_size >= offset
+                      and _edge_sha256(f, offset) == self.state.get("edge_sha256"))
+            if not append:
+                offset = 0
+                self.sums = self._empty()
+            f.seek(offset)
+            tail = f.read()
+            # Only whole lines; a half-written last row is picked up next time
+            tail = tail[:tail.rfind(b"\n") + 1]
+            edge_sha256 = _edge_sha256(f, offset + len(tail))
+
+        rows_added = 0
+        if tail.strip():
+            if offset:
+                reader = pd.read_csv(io.BytesIO(tail), header=None, names=self.state["columns"], chunksize=self.chunk_size)
+            else:
+                reader = pd.read_csv(io.BytesIO(tail), chunksize=self.chunk_size)
+            for chunk in reader:
+                self.add(chunk)
+                rows_added += len(chunk)
+                columns = list(chunk.columns)
+        else:
+            columns = self.state.get("columns", [])
+
+        self.state = {
+            "offset": offset + len(tail),
+            "mtime_ns": stat.st_mtime_ns,
+            "edge_sha256": edge_sha256,
+            "rows": (self.state.get("rows", 0) if append else 0) + rows_added,
+            "columns": columns,
+        }
+        atomic_write(self.table_path, self.sums.reset_index().to_csv(index=False))
+        atomic_write(self.state_path, json.dumps(self.state))
+        return {
+            "mode": "append" if append else "rebuild",
+            "rows_added": rows_added,
+            "rows": self.state["rows"],
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def rollup(self, by: list, cities: list = None, blood_groups: list = None,
+               months: tuple = None) -> pd.DataFrame:
+        """Sum the cohort table over everything not in ``by`` (after filtering) and add rates"""
+        sums = self.sums.reset_index()
+        if cities:
+            sums = sums[sums["city"].isin(cities)]
+        if blood_groups:
+            sums = sums[sums["blood_group"].isin(blood_groups)]
+        if months:
+            start, stop = months
+            sums = sums[(sums["month"] >= start) & (sums["month"] <= stop)]
+        grouped = sums.groupby(by)[SUM_COLUMNS].sum() if by else sums[SUM_COLUMNS].sum().to_frame().T
+        return add_rates(grouped)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the cohort aggregates and print a rollup")
+    parser.add_argument("csv", nargs="?", default=str(DEFAULT_CSV))
+    parser.add_argument("--by", nargs="+", default=["city", "blood_group"], choices=KEYS)
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse the whole CSV instead of only appended rows")
+    args = parser.parse_args(argv)
+
+    store = CohortStore(args.csv)
+    stats = store.refresh(rebuild=args.rebuild)
+    print(f"Cohort table: {len(store.sums):,} cohorts over {stats['rows']:,} rows "
+          f"({stats['mode']}, {stats['rows_added']:,} rows added in {stats['seconds'] * 1000:.1f} ms)")
+
+    t0 = time.perf_counter()
+    rollup = store.rollup(args.by)
+    rollup_ms = (time.perf_counter() - t0) * 1000
+    if args.by == ["city", "blood_group"]:
+        print(rollup["availability_rate"].unstack("blood_group").round(3).to_string())
+    else:
+        print(rollup.round(3).to_string())
+    print(f"Rollup: {rollup_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""User store and password hashing shared by the app and the auth pages.
+
+Users live in a SQLite database (``app/users.db``) keyed on username, so a
+lookup is one indexed query and a sign-up is one atomic ``INSERT`` instead of
+rewriting the whole of ``users.json``. The legacy ``users.json`` is imported
+once, the first time the database is opened.
+
+``AuthService`` runs PBKDF2 in a bounded thread pool (``pbkdf2_hmac`` releases
+the GIL), so a burst of sign-ins can't starve page renders, and it keeps
+hash-latency stats for sizing that pool. Each user record stores its own
+iteration count, so ``PBKDF2_ITERATIONS`` can be raised without breaking
+existing hashes; old hashes are upgraded on the next successful sign-in.
+"""
+import binascii
+import hashlib
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from app_pkg.paths import ROOT_DIR
+
+USERS_DB_PATH = ROOT_DIR / "app" / "users.db"
+USERS_JSON_PATH = ROOT_DIR / "app" / "users.json"
+PBKDF2_ITERATIONS = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username   TEXT PRIMARY KEY,
+    salt       TEXT NOT NULL,
+    hash       TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    iterations INTEGER NOT NULL DEFAULT 100000
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _hash_password(password: str, salt: bytes = None, iterations: int = PBKDF2_ITERATIONS) -> tuple:
+    if salt is None:
+        salt = secrets.token_bytes(16)
+    pwd_hash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return binascii.hexlify(salt).decode(), binascii.hexlify(pwd_hash).decode()
+
+
+def verify_password(stored_salt_hex: str, stored_hash_hex: str, provided_password: str,
+                    iterations: int = PBKDF2_ITERATIONS) -> bool:
+    salt = binascii.unhexlify(stored_salt_hex.encode())
+    _, new_hash = _hash_password(provided_password, salt, iterations)
+    return secrets.compare_digest(new_hash, stored_hash_hex)
+
+
+def normalize_username(username: str) -> str:
+    return (username or "").strip().lower()
+
+
+class UserStore:
+    """SQLite-backed users table; safe for concurrent sign-ups from several sessions"""
+
+    def __init__(self, db_path: Path = USERS_DB_PATH, legacy_json_path: Path = USERS_JSON_PATH):
+        self.db_path = Path(db_path)
+        self.legacy_json_path = Path(legacy_json_path)
+        with self._connect() as conn:
+            # WAL lets sign-ins read while a sign-up is writing; the setting persists in the file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+            if "iterations" not in columns:
+                # Databases created before per-user iteration counts were all hashed at 100k
+                conn.execute("ALTER TABLE users ADD COLUMN iterations INTEGER NOT NULL DEFAULT 100000")
+        self._migrate_legacy_json()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation (Streamlit reruns on different threads)"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _migrate_legacy_json(self):
+        """Import users.json exactly once"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_users_json'").fetchone()
+            if done:
+                return
+            users = {}
+            if self.legacy_json_path.exists():
+                try:
+                    users = json.loads(self.legacy_json_path.read_text())
+                except Exception:
+                    users = {}
+            now = int(time.time())
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (username, salt, hash, created_at, iterations) VALUES (?, ?, ?, ?, ?)",
+                [(normalize_username(name), u["salt"], u["hash"], now, int(u.get("iterations", 100_000)))
+                 for name, u in users.items() if isinstance(u, dict) and "salt" in u and "hash" in u],
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_users_json', ?)",
+                (str(len(users)),),
+            )
+
+    def get_user(self, username: str):
+        """Return {"salt", "hash", "iterations"} for a user, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT salt, hash, iterations FROM users WHERE username = ?", (normalize_username(username),)
+            ).fetchone()
+        return {"salt": row[0], "hash": row[1], "iterations": row[2]} if row else None
+
+    def user_exists(self, username: str) -> bool:
+        return self.get_user(username) is not None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def insert_user(self, username: str, salt_hex: str, hash_hex: str,
+                    iterations: int = PBKDF2_ITERATIONS) -> bool:
+        """Insert an already-hashed user atomically; False if the name is taken"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO users (username, salt, hash, created_at, iterations) VALUES (?, ?, ?, ?, ?)",
+                    (normalize_username(username), salt_hex, hash_hex, int(time.time()), iterations),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update_hash(self, username: str, salt_hex: str, hash_hex: str, iterations: int):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE users SET salt = ?, hash = ?, iterations = ? WHERE username = ?",
+                (salt_hex, hash_hex, iterations, normalize_username(username)),
+            )
+
+    def create_user(self, username: str, password: str, iterations: int = PBKDF2_ITERATIONS) -> bool:
+        """Hash and insert a new user; False if the name is taken or inputs are empty"""
+        username = normalize_username(username)
+        if not username or not password:
+            return False
+        if self.user_exists(username):
+            return False
+        salt_hex, hash_hex = _hash_password(password, iterations=iterations)
+        return self.insert_user(username, salt_hex, hash_hex, iterations)
+
+    def authenticate(self, username: str, password: str) -> bool:
+        user = self.get_user(username)
+        if user is None:
+            return False
+        return verify_password(user["salt"], user["hash"], password, user["iterations"])
+
+
+class AuthService:
+    """Runs key derivation for sign-in/sign-up in a bounded worker pool.
+
+    ``max_workers`` caps how many PBKDF2 computations run at once; extra
+    requests queue instead of competing with page renders for every core.
+    """
+
+    def __init__(self, store: UserStore = None, max_workers: int = None,
+                 iterations: int = PBKDF2_ITERATIONS, latency_window: int = 1000, telemetry=None):
+        self.store = store if store is not None else UserStore()
+        # Optional app_pkg.telemetry.Telemetry; gets "auth.hash" and "auth.queue_wait" observations
+        self.telemetry = telemetry
+        if max_workers is None:
+            # Leave at least one core for rendering
+            max_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.max_workers = max_workers
+        self.iterations = iterations
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pbkdf2")
+        self._lock = threading.Lock()
+        self._hash_seconds = deque(maxlen=latency_window)
+        self._wait_seconds = deque(maxlen=latency_window)
+        self.hashes = 0
+
+    def _timed(self, fn, *args) -> Future:
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.hashes += 1
+                    self._wait_seconds.append(started - submitted)
+                    self._hash_seconds.append(finished - started)
+                if self.telemetry is not None:
+                    self.telemetry.observe("auth.queue_wait", started - submitted)
+                    self.telemetry.observe("auth.hash", finished - started)
+
+        return self._pool.submit(run)
+
+    def authenticate(self, username: str, password: str, timeout: float = None) -> bool:
+        """Verify credentials off-thread; upgrades the stored hash if its iteration count is stale"""
+        user = self.store.get_user(username)
+        if user is None or not password:
+            return False
+        ok = self._timed(verify_password, user["salt"], user["hash"], password, user["iterations"]).result(timeout)
+        if ok and user["iterations"] < self.iterations:
+            salt_hex, hash_hex = self._timed(_hash_password, password, None, self.iterations).result(timeout)
+            self.store.update_hash(username, salt_hex, hash_hex, self.iterations)
+        return ok
+
+    def create_user(self, username: str, password: str, timeout: float = None) -> bool:
+        username = normalize_username(username)
+        if not username or not password or self.store.user_exists(username):
+            return False
+        salt_hex, hash_hex = self._timed(_hash_password, password, None, self.iterations).result(timeout)
+        return self.store.insert_user(username, salt_hex, hash_hex, self.iterations)
+
+    def stats(self) -> dict:
+        """Hash and queue-wait latency percentiles in milliseconds"""
+        with self._lock:
+            hash_ms = sorted(x * 1000 for x in self._hash_seconds)
+            wait_ms = sorted(x * 1000 for x in self._wait_seconds)
+            hashes = self.hashes
+
+        def pct(values, q):
+            return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+        return {
+            "workers": self.max_workers,
+            "iterations": self.iterations,
+            "hashes": hashes,
+            "hash_ms_p50": pct(hash_ms, 0.50),
+            "hash_ms_p95": pct(hash_ms, 0.95),
+            "hash_ms_max": hash_ms[-1] if hash_ms else None,
+            "queue_wait_ms_p50": pct(wait_ms, 0.50),
+            "queue_wait_ms_p95": pct(wait_ms, 0.95),
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_auth_service() -> AuthService:
+    """Process-wide instance shared by the sign-in and sign-up pages, so both use one PBKDF2 pool"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            from app_pkg.telemetry import get_telemetry
+
+            # Hash and queue-wait latencies show up as auth.hash / auth.queue_wait in the Performance panel
+            _default = AuthService(telemetry=get_telemetry())
+    return _default
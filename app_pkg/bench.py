@@ -0,0 +1,230 @@
+"""Headless benchmark suite with machine-readable output.
+
+Suites:
+
+* ``predict``  - pipeline ``predict_proba`` one row per call vs batched at
+  several batch sizes, and the same for the NumPy fast path
+* ``features`` - ``derive_features`` over each CSV in ``data/`` (and tiled up)
+* ``pdf``      - one prediction PDF vs bulk rosters of growing size
+* ``users``    - user lookup/insert latency as the user table grows to 100k,
+  plus a full PBKDF2 sign-up at each size
+
+Results go to stdout (or ``-o``) as one JSON document with an environment
+block, so runs can be diffed or charted; a readable table goes to stderr.
+
+    python -m app_pkg.bench
+    python -m app_pkg.bench --suites predict users -o bench.json
+    python -m app_pkg.bench --quick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.features import derive_features, derive_record
+from app_pkg.paths import DATA_DIR, MODEL_PATH
+
+SUITES = ["predict", "features", "pdf", "users"]
+BATCH_SIZES = [1, 10, 100, 1000, 10_000]
+USER_COUNTS = [1_000, 10_000, 100_000]
+BULK_PDF_DONORS = [10, 100, 1000]
+
+
+def _time(fn, repeat: int = 3) -> float:
+    """Median wall-clock seconds of ``repeat`` calls"""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def _result(suite: str, case: str, items: int, seconds: float, **params) -> dict:
+    return {
+        "suite": suite,
+        "case": case,
+        "params": params,
+        "items": items,
+        "seconds": seconds,
+        "per_item_ms": seconds / items * 1000 if items else None,
+        "items_per_second": items / seconds if seconds else None,
+    }
+
+
+def _tile(df: pd.DataFrame, rows: int) -> pd.DataFrame:
+    reps = -(-rows // max(len(df), 1))
+    return pd.concat([df] * reps, ignore_index=True).iloc[:rows]
+
+
+def _donors() -> pd.DataFrame:
+    return pd.read_csv(DATA_DIR / "Blood_Donor_updated.csv")
+
+
+def bench_predict(quick: bool = False) -> list:
+    import joblib
+
+    from app_pkg.fastpath import FastPredictor
+
+    model = joblib.load(MODEL_PATH)
+    sizes = BATCH_SIZES[:-1] if quick else BATCH_SIZES
+    raw = _tile(_donors(), max(sizes))
+    X = derive_features(raw)
+    records = raw.head(200).to_dict(orient="records")
+    results = []
+
+    # One predict_proba call per donor, the way the app scored a single prediction
+    rows = 50 if quick else 200
+    seconds = _time(lambda: [model.predict_proba(X.iloc[[i]]) for i in range(rows)], repeat=1)
+    results.append(_result("predict", "pipeline_single_row", rows, seconds))
+    for size in sizes:
+        batch = X.iloc[:size]
+        seconds = _time(lambda: model.predict_proba(batch), repeat=3 if size < 10_000 else 1)
+        results.append(_result("predict", "pipeline_batch", size, seconds, batch_size=size))
+
+    try:
+        fast = FastPredictor.from_pipeline(model)
+    except (TypeError, KeyError, AttributeError):
+        return results
+    seconds = _time(lambda: [fast.predict_proba_record(r) for r in records[:rows]])
+    results.append(_result("predict", "fastpath_single_record", rows, seconds))
+    for size in sizes:
+        batch = X.iloc[:size]
+        seconds = _time(lambda: fast.predict_proba(batch))
+        results.append(_result("predict", "fastpath_batch", size, seconds, batch_size=size))
+    return results
+
+
+def bench_features(quick: bool = False) -> list:
+    results = []
+    for csv_path in sorted(DATA_DIR.glob("*.csv")):
+        df = pd.read_csv(csv_path)
+        seconds = _time(lambda: derive_features(df))
+        results.append(_result("features", "derive_features", len(df), seconds, file=csv_path.name))
+
+    df = _donors()
+    tiled = _tile(df, 20_000 if quick else 200_000)
+    seconds = _time(lambda: derive_features(tiled), repeat=1)
+    results.append(_result("features", "derive_features_tiled", len(tiled), seconds, file=f"{len(tiled)} rows"))
+
+    records = df.head(1000).to_dict(orient="records")
+    seconds = _time(lambda: [derive_record(r) for r in records])
+    results.append(_result("features", "derive_record_loop", len(records), seconds))
+    return results
+
+
+def bench_pdf(quick: bool = False) -> list:
+    import joblib
+
+    from app_pkg.batch import score_frame
+    from app_pkg.reports import generate_bulk_pdf, generate_prediction_pdf
+
+    donors = BULK_PDF_DONORS[:-1] if quick else BULK_PDF_DONORS
+    scored, _ = score_frame(joblib.load(MODEL_PATH), _donors().head(max(donors)))
+    row = scored.iloc[0]
+    input_data = {"City": row["city"], "Blood Group": row["blood_group"],
+                  "Number of Donations": row["number_of_donation"], "Pints Donated": row["pints_donated"]}
+    prediction = {"probability": row["availability_probability"] * 100, "decision": row["decision"], "model": "bench"}
+
+    single = 10 if quick else 50
+    seconds = _time(lambda: [generate_prediction_pdf(input_data, prediction, "bench") for _ in range(single)], repeat=1)
+    results = [_result("pdf", "single_prediction_pdf", single, seconds)]
+    for n in donors:
+        seconds = _time(lambda: generate_bulk_pdf(scored.head(n), "bench", "bench"), repeat=1)
+        results.append(_result("pdf", "bulk_roster_pdf", n, seconds, donors=n))
+    return results
+
+
+def bench_users(quick: bool = False) -> list:
+    from app_pkg.auth import PBKDF2_ITERATIONS, AuthService, UserStore, _hash_password
+
+    counts = [c // 10 for c in USER_COUNTS] if quick else USER_COUNTS
+    rng = random.Random(42)
+    salt_hex, hash_hex = _hash_password("bench-password")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UserStore(Path(tmp) / "users.db", Path(tmp) / "missing.json")
+        service = AuthService(store)
+        total = 0
+        for count in counts:
+            # Seed straight through SQL; hashing 100k passwords would only measure PBKDF2
+            with store._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO users (username, salt, hash, created_at, iterations) VALUES (?, ?, ?, ?, ?)",
+                    [(f"user{i}", salt_hex, hash_hex, 0, PBKDF2_ITERATIONS) for i in range(total, count)],
+                )
+            total = count
+
+            names = [f"user{rng.randrange(count)}" for _ in range(500)]
+            seconds = _time(lambda: [store.get_user(n) for n in names], repeat=1)
+            results.append(_result("users", "get_user", len(names), seconds, users=count))
+
+            missing = [f"nobody{i}" for i in range(500)]
+            seconds = _time(lambda: [store.user_exists(n) for n in missing], repeat=1)
+            results.append(_result("users", "user_exists_missing", len(missing), seconds, users=count))
+
+            fresh = [f"new{count}_{i}" for i in range(200)]
+            seconds = _time(lambda: [store.insert_user(n, salt_hex, hash_hex) for n in fresh], repeat=1)
+            results.append(_result("users", "insert_user", len(fresh), seconds, users=count))
+
+            signups = [f"signup{count}_{i}" for i in range(3)]
+            seconds = _time(lambda: [service.create_user(n, "bench-password") for n in signups], repeat=1)
+            results.append(_result("users", "create_user_pbkdf2", len(signups), seconds, users=count))
+        service.shutdown()
+    return results
+
+
+def environment() -> dict:
+    import sklearn
+
+    return {
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite and emit JSON results")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=SUITES)
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("-o", "--output", help="Write the JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    runners = {"predict": bench_predict, "features": bench_features, "pdf": bench_pdf, "users": bench_users}
+    results = []
+    for suite in args.suites:
+        t0 = time.perf_counter()
+        suite_results = runners[suite](quick=args.quick)
+        results.extend(suite_results)
+        print(f"[{suite}] {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+        for r in suite_results:
+            params = " ".join(f"{k}={v}" for k, v in r["params"].items())
+            print(f"  {r['case']:24s} {params:24s} {r['items']:>8,} items  "
+                  f"{r['per_item_ms']:10.4f} ms/item  {r['items_per_second']:>12,.0f}/s", file=sys.stderr)
+
+    report = json.dumps({"environment": environment(), "quick": args.quick, "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
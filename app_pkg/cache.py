@@ -0,0 +1,124 @@
+"""Bounded LRU/TTL cache for single-donor predictions.
+
+Keys are the normalized model-feature tuple plus the model version, so the
+same donor profile entered twice is scored (and its PDF rendered) once. The
+whole cache is dropped automatically when the model file or its metrics
+(which carry the decision thresholds) change on disk.
+"""
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app_pkg.features import MODEL_FEATURES, derive_record
+from app_pkg.paths import METRICS_PATH, MODEL_PATH
+
+
+def _file_stamp(path: Path) -> tuple:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with a per-entry time-to-live"""
+
+    def __init__(self, model_path: Path = MODEL_PATH, metrics_path: Path = METRICS_PATH,
+                 max_entries: int = 1024, ttl_seconds: float = 3600.0):
+        self.model_path = Path(model_path)
+        self.metrics_path = Path(metrics_path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_stamp = self._stamp()
+        self.model_version = self._read_model_version()
+
+    def _read_model_version(self) -> str:
+        try:
+            metrics = json.loads(self.metrics_path.read_text())
+        except (OSError, ValueError):
+            metrics = {}
+        return f"{metrics.get('model', '(unknown)')}@{metrics.get('timestamp', 0)}"
+
+    def _stamp(self) -> tuple:
+        return str(self.model_path), _file_stamp(self.model_path), _file_stamp(self.metrics_path)
+
+    def _check_model(self):
+        # Caller holds the lock
+        stamp = self._stamp()
+        if stamp != self._model_stamp:
+            self._entries.clear()
+            self._model_stamp = stamp
+            self.model_version = self._read_model_version()
+            self.invalidations += 1
+
+    def bind_model(self, model_path: Path, metrics_path: Path):
+        """Follow a different model artifact (e.g. a newly promoted registry version)"""
+        with self._lock:
+            self.model_path = Path(model_path)
+            self.metrics_path = Path(metrics_path)
+            self._check_model()
+
+    def make_key(self, record: dict = None, features: dict = None) -> tuple:
+        """Normalize a raw donor record (or its ``derive_record`` output) into the hashable model-feature tuple"""
+        if features is None:
+            features = derive_record(record)
+        return tuple(
+            None if isinstance(features[c], float) and math.isnan(features[c]) else features[c]
+            for c in MODEL_FEATURES
+        )
+
+    def get(self, key: tuple):
+        """Return the cached entry dict or None"""
+        with self._lock:
+            self._check_model()
+            full_key = (self.model_version, key)
+            entry = self._entries.get(full_key)
+            if entry is None or time.monotonic() - entry["_stored_at"] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[full_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(full_key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, probability: float, decision: str) -> dict:
+        with self._lock:
+            self._check_model()
+            full_key = (self.model_version, key)
+            entry = {"probability": probability, "decision": decision, "pdf": {}, "_stored_at": time.monotonic()}
+            self._entries[full_key] = entry
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def attach_pdf(self, entry: dict, username: str, pdf_bytes: bytes):
+        """Keep the rendered report with its prediction (reports are per user)"""
+        with self._lock:
+            entry["pdf"][username] = pdf_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "invalidations": self.invalidations,
+                "model_version": self.model_version,
+            }
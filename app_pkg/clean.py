@@ -0,0 +1,200 @@
+"""Chunked version of the notebook's cleaning for CSVs too big to load whole.
+
+``train.clean_frame`` runs ``drop_duplicates``, drops rows with a missing
+target and applies ``iqr_mask`` with quartiles of the whole frame. Here the
+same three steps run over ``pd.read_csv(chunksize=...)`` in two passes:
+
+1. every row is reduced to a 64-bit fingerprint; rows whose fingerprint was
+   already seen are duplicates, rows without a target are dropped, and the
+   outlier columns of the survivors feed a streaming quantile sketch
+2. the CSV is read again, the pass-one keep mask and the sketch's IQR bounds
+   are applied and the survivors are appended to the output
+
+Memory is one chunk, the fingerprint set (8 bytes of payload per distinct
+row) and the sketches. The output has the same columns and formatting as
+``data/clean_donor.csv``; with fewer than ``sketch_k`` rows per column the
+quartiles are exact and the file matches ``clean_frame`` byte for byte.
+
+    python -m app_pkg.clean data/Blood_Donor_updated.csv -o cleaned.csv
+    python -m app_pkg.clean big.csv -o big_clean.csv --chunksize 500000 --sketch-k 1024
+"""
+import argparse
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.features import OUTLIER_COLUMNS, TARGET
+from app_pkg.paths import DATA_DIR
+
+IQR_K = 3.0
+
+
+class QuantileSketch:
+    """KLL-style streaming quantile sketch: O(k log n) memory, rank error roughly 1/k
+
+    Level ``h`` holds items that each stand for ``2**h`` inputs. A full level is
+    sorted and every other item (random offset) is promoted to the next level.
+    Until the first compaction the sketch holds every value and is exact.
+    """
+
+    def __init__(self, k: int = 512, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        # Lower levels get geometrically less room than the top one
+        depth = len(self.levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind so the total weight is preserved
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], pairs[self._rng.randint(0, 1)::2]])
+                self.levels[h] = keep
+            h += 1
+
+    def quantile(self, q: float) -> float:
+        """Linearly interpolated quantile, like ``pd.Series.quantile``"""
+        if not self.n:
+            return float("nan")
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** h, dtype=np.int64) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="mergesort")
+        values, ends = values[order], np.cumsum(weights[order])
+        rank = q * (ends[-1] - 1)
+        lo, hi = int(np.floor(rank)), int(np.ceil(rank))
+        # The item covering 0-based rank r is the first whose cumulative weight exceeds r
+        v_lo, v_hi = values[np.searchsorted(ends, [lo, hi], side="right")]
+        return float(v_lo + (v_hi - v_lo) * (rank - lo))
+
+    def iqr_bounds(self, k: float = IQR_K) -> tuple:
+        q1, q3 = self.quantile(0.25), self.quantile(0.75)
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+
+
+def row_fingerprints(chunk: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of every row's values, independent of the index"""
+    return pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+
+
+def _read_chunks(csv_path: Path, chunksize: int, numeric: list):
+    # Fixed dtypes keep a row's fingerprint the same whichever chunk it lands in
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {c: (float if c in numeric else str) for c in header}
+    return pd.read_csv(csv_path, chunksize=chunksize, dtype=dtypes)
+
+
+def clean_csv(csv_path, output_path, chunksize: int = 100_000,
+              sketch_k: int = 512, k: float = IQR_K) -> dict:
+    """Dedup, drop missing targets and IQR-filter ``csv_path`` chunk by chunk; returns the report"""
+    csv_path, output_path = Path(csv_path), Path(output_path)
+    header = pd.read_csv(csv_path, nrows=0).columns
+    outlier_columns = [c for c in OUTLIER_COLUMNS if c in header]
+    report = {"input_rows": 0, "duplicates_removed": 0, "missing_target_removed": 0}
+    timings = {}
+
+    t0 = time.perf_counter()
+    seen = set()
+    keep_masks = []
+    sketches = {c: QuantileSketch(sketch_k) for c in outlier_columns}
+    for chunk in _read_chunks(csv_path, chunksize, outlier_columns):
+        report["input_rows"] += len(chunk)
+        fingerprints = row_fingerprints(chunk)
+        # First occurrence within the chunk, then not seen in any earlier chunk
+        keep = ~pd.Series(fingerprints).duplicated().to_numpy()
+        keep &= np.fromiter((f not in seen for f in fingerprints.tolist()), dtype=bool, count=len(chunk))
+        seen.update(fingerprints[keep].tolist())
+        report["duplicates_removed"] += int((~keep).sum())
+
+        has_target = chunk[TARGET].notna().to_numpy() if TARGET in chunk else np.ones(len(chunk), dtype=bool)
+        report["missing_target_removed"] += int((keep & ~has_target).sum())
+        keep &= has_target
+        for c in outlier_columns:
+            sketches[c].update(chunk[c].to_numpy()[keep])
+        keep_masks.append(np.packbits(keep))
+    del seen
+    timings["pass1_seconds"] = time.perf_counter() - t0
+
+    bounds = {c: sketches[c].iqr_bounds(k) for c in outlier_columns}
+    report["outliers_removed"] = 0
+    report["output_rows"] = 0
+
+    t0 = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp, "w", newline="") as out:
+        header_written = False
+        for chunk, packed in zip(_read_chunks(csv_path, chunksize, outlier_columns), keep_masks):
+            keep = np.unpackbits(packed, count=len(chunk)).astype(bool)
+            mask = keep.copy()
+            for c, (low, high) in bounds.items():
+                x = chunk[c].to_numpy()
+                mask &= np.isnan(x) | ((x >= low) & (x <= high))
+            report["outliers_removed"] += int(keep.sum() - mask.sum())
+            report["output_rows"] += int(mask.sum())
+            chunk[mask].to_csv(out, index=False, header=not header_written)
+            header_written = True
+        if not header_written:
+            pd.DataFrame(columns=header).to_csv(out, index=False)
+    os.replace(tmp, output_path)
+    timings["pass2_seconds"] = time.perf_counter() - t0
+
+    report["iqr_bounds"] = {c: [low, high] for c, (low, high) in bounds.items()}
+    report["sketch_exact"] = all(len(s.levels) == 1 for s in sketches.values())
+    report.update(timings)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean a donor CSV in chunks: dedup, drop missing targets, IQR filter")
+    parser.add_argument("csv", nargs="?", default=str(DATA_DIR / "Blood_Donor_updated.csv"))
+    parser.add_argument("-o", "--output", required=True,
+                        help="Cleaned CSV to write (data/clean_donor.csv is the tracked notebook output)")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--sketch-k", type=int, default=512, help="Quantile sketch size; larger is more accurate")
+    parser.add_argument("--k", type=float, default=IQR_K, help="IQR multiplier for the outlier bounds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = clean_csv(args.csv, args.output, args.chunksize, args.sketch_k, args.k)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"Input rows:              {report['input_rows']:,}")
+    print(f"Duplicates removed:      {report['duplicates_removed']:,}")
+    print(f"Missing target removed:  {report['missing_target_removed']:,}")
+    print(f"Outliers removed:        {report['outliers_removed']:,}")
+    print(f"Output rows:             {report['output_rows']:,} -> {args.output}")
+    for c, (low, high) in report["iqr_bounds"].items():
+        print(f"  {c:28s} keep [{low:g}, {high:g}]")
+    print(f"Quartiles {'exact' if report['sketch_exact'] else 'approximate'}; "
+          f"{report['pass1_seconds']:.2f}s + {report['pass2_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Typed, columnar cache of the donor CSVs.
+
+The first load of a CSV parses it once, drops the PII columns, stores city,
+blood group and availability as small integer codes, parses ``created_at``
+and writes everything to an ``.npz`` file under ``data/.cache/`` keyed on the
+SHA-256 of the source file. Later loads skip CSV parsing entirely.
+
+Which rows repeat an earlier row is decided on the full raw rows, PII
+included, before those columns are dropped; ``raw_duplicates`` returns that
+mask so cleaning dedups exactly like ``drop_duplicates`` on the CSV would.
+
+    python -m app_pkg.dataset data/Blood_Donor_updated.csv   # build + timings
+"""
+import argparse
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.paths import DATA_DIR
+
+DEFAULT_CSV = DATA_DIR / "Blood_Donor_updated.csv"
+CACHE_DIR = DATA_DIR / ".cache"
+PII_COLUMNS = ["name", "email", "password", "contact_number"]
+CATEGORY_COLUMNS = ["city", "blood_group", "availability"]
+NUMERIC_COLUMNS = ["months_since_first_donation", "number_of_donation", "pints_donated"]
+CACHE_FORMAT = 2
+
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_hash(csv_path: Path, cache_dir: Path) -> str:
+    """SHA-256 of the CSV, reusing the last value while size and mtime are unchanged"""
+    stat = csv_path.stat()
+    stamp_path = cache_dir / f"{csv_path.stem}.stamp.json"
+    stamp = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    try:
+        saved = json.loads(stamp_path.read_text())
+        if {k: saved.get(k) for k in stamp} == stamp and saved.get("sha256"):
+            return saved["sha256"]
+    except (OSError, ValueError):
+        pass
+    stamp["sha256"] = file_sha256(csv_path)
+    stamp_path.write_text(json.dumps(stamp))
+    return stamp["sha256"]
+
+
+def cache_path_for(csv_path: Path, cache_dir: Path = CACHE_DIR) -> Path:
+    csv_path = Path(csv_path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir / f"{csv_path.stem}-{_source_hash(csv_path, cache_dir)[:16]}.npz"
+
+
+def _code_dtype(n_categories: int):
+    return np.int8 if n_categories < 127 else np.int16 if n_categories < 32767 else np.int32
+
+
+def build_cache(csv_path: Path, out_path: Path) -> Path:
+    """Parse the CSV once and write the typed columnar arrays"""
+    df = pd.read_csv(csv_path)
+    # Rows that differ only in PII are distinct donors; dedup has to see them before the drop
+    duplicated = df.duplicated().to_numpy()
+    df = df.drop(columns=[c for c in PII_COLUMNS if c in df.columns])
+
+    arrays = {"format": np.array(CACHE_FORMAT), "columns": np.array(list(df.columns)),
+              "raw_duplicates": duplicated}
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            cat = pd.Categorical(df[col])
+            arrays[f"{col}__codes"] = cat.codes.astype(_code_dtype(len(cat.categories)))
+            arrays[f"{col}__categories"] = np.array(cat.categories.astype(str).tolist(), dtype=str)
+        elif col in NUMERIC_COLUMNS:
+            arrays[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32)
+        elif col == "created_at":
+            arrays[col] = pd.to_datetime(df[col], errors="coerce", format="ISO8601").to_numpy(dtype="datetime64[D]")
+        else:
+            arrays[col] = df[col].astype(object).where(df[col].notna(), "").to_numpy(dtype=str)
+
+    tmp_path = out_path.with_suffix(".tmp.npz")
+    np.savez(tmp_path, **arrays)
+    tmp_path.replace(out_path)
+    return out_path
+
+
+def read_cache(path: Path) -> pd.DataFrame:
+    with np.load(path) as z:
+        if int(z["format"]) != CACHE_FORMAT:
+            raise ValueError(f"Unsupported dataset cache format in {path}")
+        data = {}
+        for col in z["columns"].tolist():
+            if f"{col}__codes" in z.files:
+                data[col] = pd.Categorical.from_codes(z[f"{col}__codes"], z[f"{col}__categories"].tolist())
+            elif col in NUMERIC_COLUMNS or col == "created_at":
+                data[col] = z[col]
+            else:
+                data[col] = pd.Series(z[col], dtype=object).replace("", np.nan)
+    return pd.DataFrame(data)
+
+
+def _cache_format(path: Path):
+    try:
+        with np.load(path) as z:
+            return int(z["format"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _current_cache(csv_path, cache_dir: Path, refresh: bool = False) -> Path:
+    csv_path = Path(csv_path)
+    path = cache_path_for(csv_path, Path(cache_dir))
+    if refresh or _cache_format(path) != CACHE_FORMAT:
+        # Old caches for this file are stale once its hash changes
+        for old in Path(cache_dir).glob(f"{csv_path.stem}-*.npz"):
+            old.unlink()
+        build_cache(csv_path, path)
+    return path
+
+
+def load_donor_dataset(csv_path=DEFAULT_CSV, cache_dir: Path = CACHE_DIR, refresh: bool = False) -> pd.DataFrame:
+    """Donor table without PII, typed, loaded from the cache when the CSV is unchanged.
+
+    city/blood_group/availability come back as ``category``, counts as
+    ``float32`` and ``created_at`` as ``datetime64``.
+    """
+    return read_cache(_current_cache(csv_path, cache_dir, refresh))
+
+
+def raw_duplicates(csv_path=DEFAULT_CSV, cache_dir: Path = CACHE_DIR) -> np.ndarray:
+    """Boolean mask, aligned with ``load_donor_dataset``, of rows repeating an earlier raw CSV row"""
+    with np.load(_current_cache(csv_path, cache_dir)) as z:
+        return z["raw_duplicates"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the typed donor dataset cache and compare load times")
+    parser.add_argument("csv", nargs="?", default=str(DEFAULT_CSV))
+    parser.add_argument("--refresh", action="store_true", help="Rebuild even if the cache is current")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    raw = pd.read_csv(args.csv)
+    csv_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    load_donor_dataset(args.csv, refresh=args.refresh)
+    first_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    df = load_donor_dataset(args.csv)
+    cached_seconds = time.perf_counter() - t0
+
+    raw_mb = raw.memory_usage(deep=True).sum() / 1e6
+    cached_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"Cache file         : {cache_path_for(Path(args.csv))}")
+    print(f"pd.read_csv        : {csv_seconds * 1000:.1f} ms, {raw_mb:.2f} MB")
+    print(f"First cached load  : {first_seconds * 1000:.1f} ms")
+    print(f"Cached load        : {cached_seconds * 1000:.1f} ms, {cached_mb:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Compact, PII-free donor table for serving-side lookups.
+
+``DonorStore`` keeps only the fields the model reads, one typed NumPy array
+each, instead of a DataFrame of object columns:
+
+* ``city`` / ``blood_group`` - ``uint8`` codes into ``cities`` / ``blood_groups``
+  (``MISSING_CODE`` when blank)
+* counts - ``int16`` when every value is a whole number that fits
+  (``MISSING_COUNT`` when blank), ``float32`` otherwise
+* ``created_at`` - proleptic Gregorian ordinal as ``int32`` (0 when blank)
+* ``donor_id`` - fixed-width bytes
+
+``donor_id`` is indexed by an open-addressing hash table of ``int32`` row
+numbers (power-of-two size, at most half full), so a lookup is one hash and
+usually one probe. When an id appears more than once the last row wins.
+``score`` reads one donor's scalars straight out of the arrays, derives the
+features with ``features.derive_record`` and runs the fast-path weights on
+them - no row copy, Series or DataFrame; ``score_all`` goes through
+``features.derive_numeric`` the same way.
+
+    python -m app_pkg.donors                # memory footprint vs the DataFrame, lookup/score latency
+    python -m app_pkg.donors 1b8b4c828a     # one donor's record and probability
+"""
+import argparse
+import math
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.dataset import DEFAULT_CSV, NUMERIC_COLUMNS, load_donor_dataset
+from app_pkg.features import BLOOD_GROUPS, CITIES, derive_numeric, derive_record
+
+MISSING_CODE = 255
+MISSING_COUNT = np.iinfo(np.int16).min
+MISSING_DATE = 0
+# date(1970, 1, 1).toordinal(), to go between ordinals and datetime64[D]
+EPOCH_ORDINAL = 719163
+
+
+def _codes(values: pd.Series, known: list) -> tuple:
+    """uint8 codes into ``known`` plus any other values seen, in sorted order"""
+    values = values.astype(object).where(values.notna() & (values.astype(object) != ""), None)
+    extra = sorted(set(values.dropna().astype(str)) - set(known))
+    categories = list(known) + extra
+    if len(categories) >= MISSING_CODE:
+        raise ValueError(f"Too many categories for uint8 codes: {len(categories)}")
+    codes = pd.Categorical(values, categories=categories).codes
+    return np.where(codes < 0, MISSING_CODE, codes).astype(np.uint8), categories
+
+
+def _counts(values: pd.Series) -> np.ndarray:
+    x = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    finite = x[~np.isnan(x)]
+    if np.all(finite == np.round(finite)) and np.all((finite > MISSING_COUNT) & (finite <= np.iinfo(np.int16).max)):
+        return np.where(np.isnan(x), MISSING_COUNT, x).astype(np.int16)
+    return x.astype(np.float32)
+
+
+def _ordinals(values: pd.Series) -> np.ndarray:
+    days = pd.to_datetime(values, errors="coerce", format="ISO8601").to_numpy(dtype="datetime64[D]")
+    missing = np.isnat(days)
+    ordinals = days.astype(np.int64) + EPOCH_ORDINAL
+    return np.where(missing, MISSING_DATE, ordinals).astype(np.int32)
+
+
+def _build_index(ids: np.ndarray) -> tuple:
+    """Linear-probing table of row numbers for every non-empty id (last row per id)"""
+    capacity = 8
+    while capacity < 2 * len(ids):
+        capacity *= 2
+    mask = capacity - 1
+    table = np.full(capacity, -1, dtype=np.int32)
+
+    # Last occurrence of each id; rows without an id are not indexed
+    _, first_from_end = np.unique(ids[::-1], return_index=True)
+    rows = np.sort(len(ids) - 1 - first_from_end)
+    rows = rows[ids[rows] != b""]
+    slots = np.fromiter((hash(key) for key in ids[rows].tolist()), dtype=np.int64, count=len(rows)) & mask
+
+    # Place every key at once: a key takes its slot if it is free and no earlier
+    # pending key claims it too, otherwise it moves one slot on and tries again
+    pending = np.arange(len(rows))
+    while len(pending):
+        free = np.flatnonzero(table[slots[pending]] < 0)
+        _, first = np.unique(slots[pending[free]], return_index=True)
+        won = pending[free[first]]
+        table[slots[won]] = rows[won]
+        lost = np.ones(len(pending), dtype=bool)
+        lost[free[first]] = False
+        pending = pending[lost]
+        slots[pending] = (slots[pending] + 1) & mask
+    return table, mask
+
+
+class DonorStore:
+    """Model fields of the donor table as typed arrays with an O(1) ``donor_id`` index"""
+
+    def __init__(self, donors: pd.DataFrame):
+        n = len(donors)
+        ids = donors["donor_id"] if "donor_id" in donors.columns else pd.Series([None] * n)
+        ids = ids.astype(object).where(ids.notna(), "").astype(str)
+        self.ids = np.array([i.encode("utf-8") for i in ids], dtype="S") if n else np.empty(0, dtype="S1")
+        self.city, self.cities = _codes(donors["city"].astype(object).replace({"Others": "Unknown"}), CITIES)
+        self.blood_group, self.blood_groups = _codes(donors["blood_group"], BLOOD_GROUPS)
+        self.months_since_first_donation = _counts(donors["months_since_first_donation"])
+        self.number_of_donation = _counts(donors["number_of_donation"])
+        self.pints_donated = _counts(donors["pints_donated"])
+        self.created_at = _ordinals(donors["created_at"])
+        self._table, self._mask = _build_index(self.ids)
+        self._weights = (None, None)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, csv_path=DEFAULT_CSV) -> "DonorStore":
+        """Build from the typed, PII-free dataset cache"""
+        return cls(load_donor_dataset(csv_path))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, donor_id) -> bool:
+        return self.row_of(donor_id) >= 0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays and the index"""
+        arrays = [self.ids, self.city, self.blood_group, self.created_at, self._table]
+        arrays += [getattr(self, c) for c in NUMERIC_COLUMNS]
+        return sum(a.nbytes for a in arrays)
+
+    def row_of(self, donor_id) -> int:
+        """Row number for ``donor_id``, or -1"""
+        if donor_id is None:
+            return -1
+        key = str(donor_id).strip().encode("utf-8")
+        if not key:
+            return -1
+        slot = hash(key) & self._mask
+        while True:
+            row = int(self._table[slot])
+            if row < 0 or self.ids[row] == key:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def _count(self, column: str, row: int) -> float:
+        value = getattr(self, column)[row]
+        if value.dtype == np.int16:
+            return math.nan if value == MISSING_COUNT else float(value)
+        return float(value)
+
+    def _date(self, row: int):
+        ordinal = int(self.created_at[row])
+        return None if ordinal == MISSING_DATE else date.fromordinal(ordinal)
+
+    def record(self, donor_id) -> dict:
+        """Raw fields for ``donor_id`` in the shape the sidebar and ``derive_record`` use; None if unknown"""
+        row = self.row_of(donor_id)
+        return None if row < 0 else self._record_at(row)
+
+    def _record_at(self, row: int) -> dict:
+        city, group = int(self.city[row]), int(self.blood_group[row])
+        return {
+            "donor_id": self.ids[row].decode("utf-8"),
+            "city": None if city == MISSING_CODE else self.cities[city],
+            "blood_group": None if group == MISSING_CODE else self.blood_groups[group],
+            **{c: self._count(c, row) for c in NUMERIC_COLUMNS},
+            "created_at": self._date(row),
+        }
+
+    def _category_weights(self, fast) -> tuple:
+        """Per-code logit contributions for ``fast``, with the imputed category at ``MISSING_CODE``"""
+        with self._lock:
+            bound, weights = self._weights
+            if bound is not fast:
+                weights = []
+                for col, fill, table in zip(fast.cat_cols, fast.cat_fill, fast.cat_weight):
+                    categories = self.cities if col == "city" else self.blood_groups
+                    per_code = np.zeros(MISSING_CODE + 1)
+                    per_code[:len(categories)] = [table.get(c, 0.0) for c in categories]
+                    per_code[MISSING_CODE] = table.get(fill, 0.0)
+                    weights.append((col, per_code))
+                self._weights = (fast, weights)
+            return weights
+
+    def score(self, donor_id, fast) -> float:
+        """Probability of 'Yes' for one donor with a ``FastPredictor``; None if the id is unknown"""
+        row = self.row_of(donor_id)
+        if row < 0:
+            return None
+        numeric = derive_record(self._record_at(row))
+        z = fast.intercept
+        for col, fill, weight in zip(fast.num_cols, fast.num_fill, fast.num_weight):
+            value = numeric[col]
+            z += (fill if math.isnan(value) else value) * weight
+        codes = {"city": self.city, "blood_group": self.blood_group}
+        for col, per_code in self._category_weights(fast):
+            z += per_code[codes[col][row]]
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def score_all(self, fast) -> np.ndarray:
+        """Probability of 'Yes' for every row, vectorized over the arrays (for ranking)"""
+        counts = {}
+        for c in NUMERIC_COLUMNS:
+            x = getattr(self, c)
+            counts[c] = np.where(x == MISSING_COUNT, np.nan, x) if x.dtype == np.int16 else x.astype(float)
+        days = (self.created_at.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+        days[self.created_at == MISSING_DATE] = np.datetime64("NaT")
+        numeric = derive_numeric(*(counts[c] for c in NUMERIC_COLUMNS), days)
+        z = np.full(len(self), fast.intercept)
+        for col, fill, weight in zip(fast.num_cols, fast.num_fill, fast.num_weight):
+            z += np.where(np.isnan(numeric[col]), fill, numeric[col]) * weight
+        codes = {"city": self.city, "blood_group": self.blood_group}
+        for col, per_code in self._category_weights(fast):
+            z += per_code[codes[col]]
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+def _per_call_us(fn, args: list) -> float:
+    t0 = time.perf_counter()
+    for a in args:
+        fn(a)
+    return (time.perf_counter() - t0) / len(args) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact donor store: memory footprint and lookup/score latency")
+    parser.add_argument("donor_id", nargs="?", help="Show one donor's record and probability")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV))
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    from app_pkg.fastpath import FastPredictor
+    from app_pkg.paths import MODEL_PATH
+
+    fast = FastPredictor.from_pipeline(joblib.load(MODEL_PATH))
+    store = DonorStore.load(args.csv)
+    if args.donor_id:
+        record = store.record(args.donor_id)
+        if record is None:
+            print(f"Unknown donor_id: {args.donor_id}")
+            return
+        print(record)
+        print(f"P(available) = {store.score(args.donor_id, fast):.4f}")
+        return
+
+    raw = pd.read_csv(args.csv)
+    typed = load_donor_dataset(args.csv)
+    print(f"{'representation':38s} {'MB':>8s} {'bytes/donor':>12s}")
+    for name, size in [("pd.read_csv (all columns, with PII)", raw.memory_usage(deep=True).sum()),
+                       ("load_donor_dataset (typed, no PII)", typed.memory_usage(deep=True).sum()),
+                       ("DonorStore arrays + hash index", store.nbytes)]:
+        print(f"{name:38s} {size / 1e6:8.3f} {size / len(raw):12.1f}")
+
+    ids = raw["donor_id"].dropna().sample(2000, replace=True, random_state=0).tolist()
+    by_id = raw.drop_duplicates("donor_id", keep="last").dropna(subset=["donor_id"]).set_index("donor_id")
+    print(f"Lookup: DonorStore {_per_call_us(store.row_of, ids):.2f}µs | "
+          f"DataFrame .loc {_per_call_us(lambda i: by_id.loc[i], ids[:500]):.2f}µs | "
+          f"boolean mask {_per_call_us(lambda i: raw[raw['donor_id'] == i], ids[:200]):.2f}µs")
+    print(f"Score one donor: DonorStore {_per_call_us(lambda i: store.score(i, fast), ids):.2f}µs | "
+          f"record dict + fast path {_per_call_us(lambda i: fast.predict_proba_record(by_id.loc[i].to_dict()), ids[:500]):.2f}µs")
+    t0 = time.perf_counter()
+    store.score_all(fast)
+    print(f"Score all {len(store):,} donors: {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
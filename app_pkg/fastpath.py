@@ -0,0 +1,185 @@
+"""Compiled fast-path predictor for the saved logistic-regression pipeline.
+
+``FastPredictor.from_pipeline`` flattens the fitted ``Pipeline`` (median
+imputer + scaler for numbers, most-frequent imputer + one-hot for categories,
+then ``LogisticRegression``) into plain NumPy arrays, so scoring one donor is
+a handful of float operations instead of DataFrame construction and sparse
+one-hot work.
+
+    python -m app_pkg.fastpath export   # writes models/final_model_fast.npz (not tracked)
+    python -m app_pkg.fastpath check    # parity + latency against the pipeline
+"""
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.features import derive_features, derive_record
+from app_pkg.paths import DATA_DIR, MODEL_PATH, MODELS_DIR
+
+FAST_MODEL_PATH = MODELS_DIR / "final_model_fast.npz"
+
+
+class FastPredictor:
+    """NumPy-only scorer equivalent to the fitted sklearn pipeline"""
+
+    def __init__(self, num_cols, num_fill, num_scale, num_coef,
+                 cat_cols, cat_fill, categories, cat_coef, intercept: float):
+        self.num_cols = list(num_cols)
+        self.num_fill = np.asarray(num_fill, dtype=float)
+        self.num_scale = np.asarray(num_scale, dtype=float)
+        self.num_coef = np.asarray(num_coef, dtype=float)
+        # Fold the scaler into the weights: (x / scale) . w == x . (w / scale)
+        self.num_weight = self.num_coef / self.num_scale
+        self.cat_cols = list(cat_cols)
+        self.cat_fill = list(cat_fill)
+        self.categories = [list(c) for c in categories]
+        self.cat_coef = [np.asarray(c, dtype=float) for c in cat_coef]
+        self.cat_weight = [dict(zip(cats, coef.tolist())) for cats, coef in zip(self.categories, self.cat_coef)]
+        self.intercept = float(intercept)
+
+    @classmethod
+    def from_pipeline(cls, pipe) -> "FastPredictor":
+        """Flatten a fitted ``Pipeline([('pre', ColumnTransformer), ('clf', LogisticRegression)])``"""
+        pre, clf = pipe.named_steps["pre"], pipe.named_steps["clf"]
+        if not hasattr(clf, "coef_") or clf.coef_.shape[0] != 1:
+            raise TypeError(f"Fast path only supports binary linear classifiers, got {type(clf).__name__}")
+
+        num_pipe, cat_pipe = pre.named_transformers_["num"], pre.named_transformers_["cat"]
+        num_cols = [c for name, _, cols in pre.transformers_ if name == "num" for c in cols]
+        cat_cols = [c for name, _, cols in pre.transformers_ if name == "cat" for c in cols]
+        scaler, encoder = num_pipe.named_steps["sc"], cat_pipe.named_steps["oh"]
+        if getattr(scaler, "with_mean", False) or encoder.drop is not None:
+            raise TypeError("Fast path expects StandardScaler(with_mean=False) and OneHotEncoder(drop=None)")
+
+        coef = clf.coef_[0]
+        n_num = len(num_cols)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_num)
+        cat_coef, offset = [], n_num
+        for cats in encoder.categories_:
+            cat_coef.append(coef[offset:offset + len(cats)])
+            offset += len(cats)
+
+        return cls(
+            num_cols, num_pipe.named_steps["imp"].statistics_, scale, coef[:n_num],
+            cat_cols, cat_pipe.named_steps["imp"].statistics_,
+            [list(map(str, c)) for c in encoder.categories_], cat_coef, clf.intercept_[0],
+        )
+
+    def save(self, path=FAST_MODEL_PATH):
+        arrays = {
+            "num_cols": np.array(self.num_cols),
+            "num_fill": self.num_fill,
+            "num_scale": self.num_scale,
+            "num_coef": self.num_coef,
+            "cat_cols": np.array(self.cat_cols),
+            "cat_fill": np.array(self.cat_fill),
+            "intercept": np.array(self.intercept),
+        }
+        for i, (cats, coef) in enumerate(zip(self.categories, self.cat_coef)):
+            arrays[f"categories_{i}"] = np.array(cats)
+            arrays[f"cat_coef_{i}"] = coef
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path=FAST_MODEL_PATH) -> "FastPredictor":
+        with np.load(path) as z:
+            n_cat = len(z["cat_cols"])
+            return cls(
+                z["num_cols"].tolist(), z["num_fill"], z["num_scale"], z["num_coef"],
+                z["cat_cols"].tolist(), z["cat_fill"].tolist(),
+                [z[f"categories_{i}"].tolist() for i in range(n_cat)],
+                [z[f"cat_coef_{i}"] for i in range(n_cat)],
+                float(z["intercept"]),
+            )
+
+    def predict_proba_record(self, record: dict) -> float:
+        """Probability of 'Yes' for one raw donor record, without pandas"""
+        return self.predict_proba_features(derive_record(record))
+
+    def predict_proba_features(self, features: dict) -> float:
+        """Probability of 'Yes' for one ``derive_record`` output"""
+        z = self.intercept
+        for col, fill, weight in zip(self.num_cols, self.num_fill, self.num_weight):
+            value = features[col]
+            z += (fill if math.isnan(value) else value) * weight
+        for col, fill, weights in zip(self.cat_cols, self.cat_fill, self.cat_weight):
+            value = features[col]
+            # Unknown categories contribute nothing (handle_unknown='ignore')
+            z += weights.get(value if isinstance(value, str) else fill, 0.0)
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def decision_function(self, X: pd.DataFrame) -> np.ndarray:
+        num = X[self.num_cols].to_numpy(dtype=float)
+        num = np.where(np.isnan(num), self.num_fill, num)
+        z = num @ self.num_weight + self.intercept
+        for col, fill, cats, coef in zip(self.cat_cols, self.cat_fill, self.categories, self.cat_coef):
+            values = X[col].astype(object).where(X[col].notna(), fill)
+            # -1 for categories the encoder never saw
+            codes = pd.Index(cats).get_indexer(values)
+            z += np.where(codes >= 0, coef[codes], 0.0)
+        return z
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """Drop-in for ``Pipeline.predict_proba`` on a derived feature frame"""
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - p, p])
+
+
+def check_parity(pipe, fast: FastPredictor, df: pd.DataFrame, atol: float = 1e-9) -> float:
+    """Max absolute probability difference between the pipeline and the fast path"""
+    X = derive_features(df)
+    expected = pipe.predict_proba(X)[:, 1]
+    vectorized = fast.predict_proba(X)[:, 1]
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    scalar = np.array([fast.predict_proba_record(r) for r in records])
+    diff = max(np.abs(expected - vectorized).max(), np.abs(expected - scalar).max())
+    if diff > atol:
+        raise AssertionError(f"Fast path differs from pipeline by {diff:.3g} (atol {atol:g})")
+    return float(diff)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export and verify the fast-path predictor")
+    parser.add_argument("command", choices=["export", "check"])
+    parser.add_argument("--model", default=str(MODEL_PATH))
+    parser.add_argument("--output", default=str(FAST_MODEL_PATH))
+    parser.add_argument("--data", default=str(DATA_DIR / "Blood_Donor_updated.csv"))
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    pipe = joblib.load(args.model)
+    fast = FastPredictor.from_pipeline(pipe)
+    if args.command == "export":
+        fast.save(args.output)
+        print("Saved:", args.output)
+        return
+
+    df = pd.read_csv(args.data)
+    try:
+        diff = check_parity(pipe, fast, df)
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"Parity OK on {len(df):,} rows (max abs diff {diff:.2e})")
+
+    record = df.iloc[0].to_dict()
+    n = 2000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fast.predict_proba_record(record)
+    fast_us = (time.perf_counter() - t0) / n * 1e6
+    X1 = derive_features(df.iloc[:1])
+    t0 = time.perf_counter()
+    for _ in range(200):
+        pipe.predict_proba(X1)
+    pipe_us = (time.perf_counter() - t0) / 200 * 1e6
+    print(f"Single-row latency: fast path {fast_us:.1f}µs | pipeline {pipe_us:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
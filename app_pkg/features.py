@@ -0,0 +1,155 @@
+"""Feature engineering shared by training, the Streamlit app and batch scoring.
+
+Every derivation is a column-wise array operation with safe division, so one
+donor and one million donors go through exactly the same code.
+"""
+import math
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Raw donor fields (same fields the sidebar collects)
+RAW_COLUMNS = [
+    "city",
+    "blood_group",
+    "months_since_first_donation",
+    "number_of_donation",
+    "pints_donated",
+    "created_at",
+]
+CATEGORICAL_FEATURES = ["city", "blood_group"]
+NUMERIC_FEATURES = [
+    "months_since_first_donation",
+    "number_of_donation",
+    "pints_donated",
+    "donations_per_month",
+    "created_at_year",
+    "created_at_month",
+    "created_at_day",
+]
+# Columns the saved pipeline was fitted on
+MODEL_FEATURES = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+# Label column, and the counts the notebook's IQR outlier filter runs on
+TARGET = "availability"
+OUTLIER_COLUMNS = ["months_since_first_donation", "number_of_donation", "pints_donated"]
+# Known category values ("Others" in the UI is mapped to "Unknown")
+CITIES = ["Adelaide", "Brisbane", "Canberra", "Darwin", "Hobart", "Melbourne", "Perth", "Sydney", "Unknown"]
+BLOOD_GROUPS = ["A+", "A-", "AB+", "AB-", "B+", "B-", "O+", "O-"]
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise ``numerator / max(denominator, 1)``; missing values stay missing"""
+    return numerator / np.maximum(denominator, 1)
+
+
+def to_frame(data) -> pd.DataFrame:
+    """Accept a DataFrame, a single record or an iterable of records"""
+    if isinstance(data, pd.DataFrame):
+        missing = [c for c in RAW_COLUMNS if c not in data.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        return data
+    if isinstance(data, Mapping):
+        data = [data]
+    return pd.DataFrame.from_records(list(data), columns=RAW_COLUMNS)
+
+
+def derive_numeric(months, donations, pints, created) -> dict:
+    """Numeric model inputs from float count arrays and a datetime array (NaN/NaT = missing)"""
+    created = pd.DatetimeIndex(created)
+    return {
+        "months_since_first_donation": months,
+        "number_of_donation": donations,
+        "pints_donated": pints,
+        "created_at_year": created.year.to_numpy(dtype=float),
+        "created_at_month": created.month.to_numpy(dtype=float),
+        "created_at_day": created.day.to_numpy(dtype=float),
+        "donations_per_month": safe_divide(donations, months),
+        "account_age_months": months,
+        "age_x_donations": months * donations,
+        "pints_per_donation": safe_divide(pints, donations),
+    }
+
+
+def derive_features(data) -> pd.DataFrame:
+    """Build the model input frame from raw donor columns, one array op per feature"""
+    df = to_frame(data)
+
+    # Map "Others" to "Unknown" for the model; blanks and None become NaN, which the
+    # pipeline's imputer treats as missing (it would one-hot None as an unknown category)
+    city = df["city"].astype(object).replace({"Others": "Unknown", "": np.nan})
+    city = city.where(city.notna(), np.nan)
+    blood_group = df["blood_group"].astype(object).replace({"": np.nan})
+    blood_group = blood_group.where(blood_group.notna(), np.nan)
+
+    months = pd.to_numeric(df["months_since_first_donation"], errors="coerce").to_numpy(dtype=float)
+    donations = pd.to_numeric(df["number_of_donation"], errors="coerce").to_numpy(dtype=float)
+    pints = pd.to_numeric(df["pints_donated"], errors="coerce").to_numpy(dtype=float)
+    # ISO8601 accepts both "2017-03-17" and "2017-03-17 00:00:00"; inferring the
+    # format from the first row would silently drop the other style
+    created = pd.to_datetime(df["created_at"], errors="coerce", format="ISO8601")
+
+    return pd.DataFrame({
+        "city": city,
+        "blood_group": blood_group,
+        **derive_numeric(months, donations, pints, created),
+    }, index=df.index)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_date(value):
+    if isinstance(value, (date, datetime)):
+        return value
+    if not value or (isinstance(value, float) and math.isnan(value)):
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        ts = pd.to_datetime(value, errors="coerce", format="ISO8601")
+        return None if pd.isna(ts) else ts
+
+
+def derive_record(record: Mapping) -> dict:
+    """Scalar twin of ``derive_features`` for a single record (no DataFrame overhead)"""
+    city = record.get("city")
+    city = "Unknown" if city == "Others" else (city or math.nan)
+    months = _to_float(record.get("months_since_first_donation"))
+    donations = _to_float(record.get("number_of_donation"))
+    pints = _to_float(record.get("pints_donated"))
+    created = _to_date(record.get("created_at"))
+
+    return {
+        "city": city,
+        "blood_group": record.get("blood_group") or math.nan,
+        "months_since_first_donation": months,
+        "number_of_donation": donations,
+        "pints_donated": pints,
+        "created_at_year": float(created.year) if created else math.nan,
+        "created_at_month": float(created.month) if created else math.nan,
+        "created_at_day": float(created.day) if created else math.nan,
+        # max() keeps a NaN first argument, matching np.maximum
+        "donations_per_month": donations / max(months, 1),
+        "account_age_months": months,
+        "age_x_donations": months * donations,
+        "pints_per_donation": pints / max(donations, 1),
+    }
+
+
+def iter_features(records: Iterable[Mapping], chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+    """Derive features for a stream of records, ``chunk_size`` rows at a time"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield derive_features(chunk)
+            chunk = []
+    if chunk:
+        yield derive_features(chunk)
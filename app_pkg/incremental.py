@@ -0,0 +1,234 @@
+"""Incremental retraining from newly recorded donation outcomes.
+
+``IncrementalModel`` is an SGD logistic model whose imputation and scaling
+statistics are running aggregates (counts, means, variances, category
+counts), so new labelled rows update it with ``partial_fit`` without
+touching history. It exposes ``predict_proba`` on a derived feature frame
+like the sklearn pipeline, so the app, the service and the batch tools use
+it unchanged once it is live in the model registry.
+
+    python -m app_pkg.incremental init --promote       # one pass over history
+    python -m app_pkg.incremental update new_outcomes.csv
+
+``update`` scores the updated model on a held-out slice of the new rows and
+only promotes it if f1_macro/roc_auc have not dropped more than
+``--max-drop`` below the live model's ``metrics.json``.
+"""
+import argparse
+import copy
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import f1_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from app_pkg.dataset import DEFAULT_CSV
+from app_pkg.features import BLOOD_GROUPS, CATEGORICAL_FEATURES, CITIES, NUMERIC_FEATURES, derive_features
+from app_pkg.registry import ModelRegistry
+from app_pkg.train import TARGET, encode_target, holdout_split, load_clean_frame
+
+MODEL_NAME = "SGD_Incremental"
+
+
+class IncrementalModel:
+    """Logistic regression trained by SGD with streaming imputation/scaling statistics"""
+
+    def __init__(self, alpha: float = 1e-4, random_state: int = 42):
+        self.num_cols = list(NUMERIC_FEATURES)
+        self.cat_cols = list(CATEGORICAL_FEATURES)
+        self.categories = {"city": list(CITIES), "blood_group": list(BLOOD_GROUPS)}
+        self.count = np.zeros(len(self.num_cols))
+        self.mean = np.zeros(len(self.num_cols))
+        self.m2 = np.zeros(len(self.num_cols))
+        self.cat_counts = {c: np.zeros(len(self.categories[c])) for c in self.cat_cols}
+        self.class_counts = np.zeros(2)
+        self.rows_seen = 0
+        self.classes_ = np.array([0, 1])
+        self.clf = SGDClassifier(loss="log_loss", alpha=alpha, random_state=random_state)
+
+    def _codes(self, X: pd.DataFrame, col: str) -> np.ndarray:
+        return pd.Categorical(X[col].astype(object), categories=self.categories[col]).codes
+
+    def _update_stats(self, X: pd.DataFrame, y: np.ndarray):
+        # Chan et al. parallel merge of (count, mean, M2) per numeric column
+        num = X[self.num_cols].to_numpy(dtype=float)
+        valid = ~np.isnan(num)
+        n_b = valid.sum(axis=0)
+        sum_b = np.where(valid, num, 0.0).sum(axis=0)
+        mean_b = np.divide(sum_b, n_b, out=np.zeros_like(sum_b), where=n_b > 0)
+        m2_b = np.where(valid, (num - mean_b) ** 2, 0.0).sum(axis=0)
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        safe_n = np.where(n > 0, n, 1)
+        self.mean = self.mean + delta * n_b / safe_n
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.count * n_b / safe_n
+        self.count = n
+
+        for col in self.cat_cols:
+            codes = self._codes(X, col)
+            self.cat_counts[col] += np.bincount(codes[codes >= 0], minlength=len(self.categories[col]))
+        self.class_counts += np.bincount(y, minlength=2)
+        self.rows_seen += len(X)
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        """Impute with running means / most frequent categories, standardize, one-hot"""
+        num = X[self.num_cols].to_numpy(dtype=float)
+        num = np.where(np.isnan(num), self.mean, num)
+        std = np.sqrt(np.divide(self.m2, self.count, out=np.ones_like(self.m2), where=self.count > 0))
+        # Centred (unlike the batch pipeline's with_mean=False): SGD diverges on raw years
+        blocks = [(num - self.mean) / np.where(std > 0, std, 1.0)]
+        for col in self.cat_cols:
+            codes = self._codes(X, col)
+            missing = X[col].isna().to_numpy()
+            codes = np.where(missing, int(np.argmax(self.cat_counts[col])), codes)
+            onehot = np.zeros((len(X), len(self.categories[col])))
+            known = codes >= 0
+            onehot[np.flatnonzero(known), codes[known]] = 1.0
+            blocks.append(onehot)
+        return np.hstack(blocks)
+
+    def partial_fit(self, X: pd.DataFrame, y) -> "IncrementalModel":
+        y = np.asarray(y, dtype=int)
+        self._update_stats(X, y)
+        # class_weight='balanced' from the running class counts
+        weights = self.class_counts.sum() / (2 * np.maximum(self.class_counts, 1))
+        self.clf.partial_fit(self.transform(X), y, classes=self.classes_, sample_weight=weights[y])
+        return self
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        return self.clf.predict_proba(self.transform(X))
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return self.clf.predict(self.transform(X))
+
+
+def prepare(df: pd.DataFrame) -> tuple:
+    """Labelled rows in the Blood_Donor_updated.csv schema -> (features, target)"""
+    df = df.dropna(subset=[TARGET]).drop_duplicates()
+    return derive_features(df), encode_target(df[TARGET]).to_numpy()
+
+
+def fit_in_chunks(model: IncrementalModel, X: pd.DataFrame, y: np.ndarray,
+                  chunk_size: int = 2048, epochs: int = 1, seed: int = 42) -> IncrementalModel:
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        order = rng.permutation(len(X))
+        for start in range(0, len(X), chunk_size):
+            idx = order[start:start + chunk_size]
+            model.partial_fit(X.iloc[idx], y[idx])
+    return model
+
+
+def evaluate(model, X: pd.DataFrame, y: np.ndarray, threshold: float = 0.5) -> dict:
+    proba = model.predict_proba(X)[:, 1]
+    result = {"f1_macro": float(f1_score(y, (proba >= threshold).astype(int), average="macro"))}
+    # ROC-AUC is undefined when the evaluation slice holds a single class
+    result["roc_auc"] = float(roc_auc_score(y, proba)) if len(np.unique(y)) == 2 else None
+    return result
+
+
+def drift_check(new: dict, current: dict, max_drop: float) -> list:
+    """Metrics that fell more than ``max_drop`` below the live model's"""
+    failures = []
+    for key in ("f1_macro", "roc_auc"):
+        if new.get(key) is not None and current.get(key) is not None and new[key] < current[key] - max_drop:
+            failures.append(f"{key} {new[key]:.4f} < live {current[key]:.4f} - {max_drop}")
+    return failures
+
+
+def _metrics(model: IncrementalModel, scores: dict, **extra) -> dict:
+    return {
+        "model": MODEL_NAME,
+        "f1_macro": scores["f1_macro"],
+        "roc_auc": scores["roc_auc"],
+        "threshold": 0.50,
+        "timestamp": int(time.time()),
+        "rows_seen": int(model.rows_seen),
+        **extra,
+    }
+
+
+def _register(registry: ModelRegistry, model, metrics: dict, promote: bool) -> str:
+    import tempfile
+    from pathlib import Path
+
+    import joblib
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "final_model.pkl"
+        joblib.dump(model, path)
+        version = registry.register(path, metrics)
+    if promote:
+        registry.promote(version)
+    return version
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally update the donor availability model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    init = sub.add_parser("init", help="Fit the incremental model once over the historical data")
+    init.add_argument("--data", default=str(DEFAULT_CSV))
+    init.add_argument("--epochs", type=int, default=5)
+    init.add_argument("--promote", action="store_true")
+    upd = sub.add_parser("update", help="Fold new labelled rows into the live incremental model")
+    upd.add_argument("csv", help="New rows in the Blood_Donor_updated.csv schema")
+    upd.add_argument("--holdout", type=float, default=0.2, help="Share of new rows kept back for the drift check")
+    upd.add_argument("--max-drop", type=float, default=0.02, help="Allowed drop in f1_macro/roc_auc")
+    upd.add_argument("--force", action="store_true", help="Promote even if the drift check fails")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    registry = ModelRegistry()
+    registry.ensure_bootstrapped()
+
+    if args.command == "init":
+        df, _ = load_clean_frame(args.data)
+        X, y = derive_features(df), encode_target(df[TARGET]).to_numpy()
+        train_idx, test_idx = holdout_split(y)
+        model = fit_in_chunks(IncrementalModel(), X.iloc[train_idx], y[train_idx], epochs=args.epochs)
+        scores = evaluate(model, X.iloc[test_idx], y[test_idx])
+        holdout = {"rows": len(df), "index": sorted(test_idx.tolist())}
+        version = _register(registry, model, _metrics(model, scores, holdout=holdout), args.promote)
+        print(f"Initial incremental model {version}: {scores}" + (" (live)" if args.promote else ""))
+        return
+
+    current_version = registry.current_version()
+    current = registry.load(current_version)
+    if not isinstance(current.model, IncrementalModel):
+        print(f"❌ Live model {current_version} is not incremental; run `python -m app_pkg.incremental init` first")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    X, y = prepare(pd.read_csv(args.csv))
+    if len(X) == 0:
+        print("No labelled rows to learn from")
+        return
+    stratify = y if len(np.unique(y)) == 2 and min(np.bincount(y)) >= 2 else None
+    X_fit, X_eval, y_fit, y_eval = train_test_split(X, y, test_size=args.holdout, stratify=stratify, random_state=42)
+
+    model = copy.deepcopy(current.model)
+    fit_in_chunks(model, X_fit, y_fit)
+    scores = evaluate(model, X_eval, y_eval)
+    update_seconds = time.perf_counter() - t0
+    print(f"Updated on {len(X_fit):,} rows in {update_seconds:.2f}s | holdout {len(X_eval):,} rows: {scores}")
+
+    failures = drift_check(scores, current.metrics, args.max_drop)
+    if failures and not args.force:
+        print("❌ Drift check failed, keeping", current_version)
+        for failure in failures:
+            print("   -", failure)
+        sys.exit(2)
+
+    version = _register(registry, model, _metrics(model, scores, parent=current_version), promote=True)
+    print(f"Promoted {version} (from {current_version})")
+
+
+if __name__ == "__main__":
+    # Re-import so pickled models reference app_pkg.incremental.IncrementalModel, not __main__
+    from app_pkg.incremental import main as _main
+
+    _main()
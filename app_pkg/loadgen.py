@@ -0,0 +1,117 @@
+"""Load generator for the HTTP scoring service.
+
+Fires single-donor requests from many threads at ``/predict`` and reports
+throughput and latency percentiles. With ``--in-process`` it starts its own
+service on an ephemeral port, which makes batching settings easy to compare::
+
+    python -m app_pkg.loadgen --in-process --max-batch-size 1
+    python -m app_pkg.loadgen --in-process --max-batch-size 64 --max-wait-ms 5
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.features import RAW_COLUMNS
+from app_pkg.paths import DATA_DIR
+
+
+def post_json(url: str, payload) -> dict:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def load_payloads(csv_path, limit: int = 1000) -> list:
+    """Sample donor records from a CSV as JSON-ready dicts"""
+    df = pd.read_csv(csv_path, usecols=RAW_COLUMNS, nrows=limit)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient="records")
+
+
+def run_load(url: str, payloads: list, concurrency: int = 32, requests_per_worker: int = 50) -> dict:
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        nonlocal errors
+        local, failed = [], 0
+        for i in range(requests_per_worker):
+            payload = payloads[(offset + i) % len(payloads)]
+            t0 = time.perf_counter()
+            try:
+                post_json(url, payload)
+            except Exception:
+                failed += 1
+                continue
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=worker, args=(i * requests_per_worker,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate load against the scoring service")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/predict")
+    parser.add_argument("--data", default=str(DATA_DIR / "Blood_Donor_updated.csv"))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per worker thread")
+    parser.add_argument("--in-process", action="store_true", help="Start a local service to test against")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    payloads = load_payloads(args.data)
+    server = service = None
+    url = args.url
+    if args.in_process:
+        from app_pkg.service import ScoringService, make_server
+
+        service = ScoringService(max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/predict"
+
+    try:
+        stats = run_load(url, payloads, args.concurrency, args.requests)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    if service is not None:
+        stats["batches"] = service.batcher.batches
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+from pathlib import Path
+
+# Project layout shared by the Streamlit app, the batch tools and training.
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / "data"
+MODELS_DIR = ROOT_DIR / "models"
+MODEL_PATH = MODELS_DIR / "final_model.pkl"
+METRICS_PATH = MODELS_DIR / "metrics.json"
+
+
+def atomic_write(path: Path, text: str):
+    """Write ``text`` to a temporary file next to ``path`` and rename it over ``path``"""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
@@ -0,0 +1,299 @@
+"""Versioned model registry with hot reload.
+
+Layout under ``models/registry/``::
+
+    v1759778381/final_model.pkl
+    v1759778381/metrics.json
+    CURRENT        <- name of the live version
+    HISTORY        <- one promoted version per line, newest last
+
+``LiveModel`` polls ``CURRENT`` from a background thread, loads and warms up
+a newly promoted version off the request path, then swaps it in with a
+single reference assignment. Requests in flight keep the snapshot they
+started with. ``prewarm_live_model`` builds the app's ``LiveModel`` off the
+UI thread so the sign-in screen renders before the model has loaded.
+
+    python -m app_pkg.registry list
+    python -m app_pkg.registry register path/to/final_model.pkl path/to/metrics.json --promote
+    python -m app_pkg.registry promote v1760000000
+    python -m app_pkg.registry rollback
+"""
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from app_pkg.paths import METRICS_PATH, MODEL_PATH, MODELS_DIR, atomic_write
+
+REGISTRY_DIR = MODELS_DIR / "registry"
+MODEL_FILE = "final_model.pkl"
+METRICS_FILE = "metrics.json"
+
+# A test donor used to warm a freshly loaded model before it takes traffic
+WARMUP_RECORD = {
+    "city": "Sydney",
+    "blood_group": "O+",
+    "months_since_first_donation": 12,
+    "number_of_donation": 4,
+    "pints_donated": 4,
+    "created_at": "2020-01-01",
+}
+
+_prewarm = None
+_prewarm_lock = threading.Lock()
+
+ModelSnapshot = namedtuple("ModelSnapshot", "version model metrics model_path metrics_path")
+
+
+class ModelRegistry:
+    """Directory of versioned model artifacts with a CURRENT pointer"""
+
+    def __init__(self, root: Path = REGISTRY_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def current_path(self) -> Path:
+        return self.root / "CURRENT"
+
+    @property
+    def history_path(self) -> Path:
+        return self.root / "HISTORY"
+
+    def list_versions(self) -> list:
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and (p / MODEL_FILE).exists())
+
+    def current_version(self):
+        try:
+            return self.current_path.read_text().strip() or None
+        except OSError:
+            return None
+
+    def history(self) -> list:
+        try:
+            return [line for line in self.history_path.read_text().splitlines() if line.strip()]
+        except OSError:
+            return []
+
+    def paths(self, version: str) -> tuple:
+        return self.root / version / MODEL_FILE, self.root / version / METRICS_FILE
+
+    def register(self, model_path, metrics=None, version: str = None) -> str:
+        """Copy a model (and its metrics dict or metrics.json path) in as a new version"""
+        if isinstance(metrics, (str, Path)):
+            metrics = json.loads(Path(metrics).read_text())
+        metrics = dict(metrics or {})
+        if version is None:
+            base = f"v{int(metrics.get('timestamp') or time.time())}"
+            version, n = base, 1
+            while (self.root / version).exists():
+                n += 1
+                version = f"{base}-{n}"
+        target = self.root / version
+        if target.exists():
+            raise ValueError(f"Version {version} is already registered")
+        staging = self.root / f".{version}.staging"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        shutil.copy2(model_path, staging / MODEL_FILE)
+        (staging / METRICS_FILE).write_text(json.dumps({**metrics, "version": version}, indent=2))
+        # Readers only ever see complete version directories
+        os.replace(staging, target)
+        return version
+
+    def promote(self, version: str):
+        """Make ``version`` live; running ``LiveModel`` instances pick it up on their next poll"""
+        if version not in self.list_versions():
+            raise ValueError(f"Unknown model version: {version}")
+        with self._lock:
+            atomic_write(self.current_path, version + "\n")
+            with open(self.history_path, "a") as f:
+                f.write(version + "\n")
+
+    def rollback(self) -> str:
+        """Re-promote the version that was live before the current one"""
+        with self._lock:
+            history = self.history()
+            current = self.current_version()
+            while history and history[-1] == current:
+                history.pop()
+            if not history:
+                raise ValueError("No previous model version to roll back to")
+            previous = history[-1]
+            atomic_write(self.current_path, previous + "\n")
+            atomic_write(self.history_path, "".join(v + "\n" for v in history))
+        return previous
+
+    def ensure_bootstrapped(self, model_path: Path = MODEL_PATH, metrics_path: Path = METRICS_PATH):
+        """Seed an empty registry from models/final_model.pkl so there is always a CURRENT"""
+        if self.current_version() is not None or not Path(model_path).exists():
+            return
+        metrics = json.loads(Path(metrics_path).read_text()) if Path(metrics_path).exists() else {}
+        version = f"v{int(metrics.get('timestamp') or time.time())}"
+        if version not in self.list_versions():
+            self.register(model_path, metrics, version)
+        self.promote(version)
+
+    def live_paths(self) -> tuple:
+        """(model, metrics) paths of the live version; models/final_model.pkl if there is none"""
+        self.ensure_bootstrapped()
+        version = self.current_version()
+        return self.paths(version) if version else (MODEL_PATH, METRICS_PATH)
+
+    def load(self, version: str) -> ModelSnapshot:
+        import joblib
+
+        model_path, metrics_path = self.paths(version)
+        metrics = json.loads(metrics_path.read_text()) if metrics_path.exists() else {}
+        return ModelSnapshot(version, joblib.load(model_path), metrics, model_path, metrics_path)
+
+
+def warm_up(model):
+    """Run one prediction so lazy initialisation happens before real traffic"""
+    # Imported here so importing the registry doesn't pull in pandas
+    from app_pkg.features import derive_features
+
+    model.predict_proba(derive_features(WARMUP_RECORD))
+
+
+class LiveModel:
+    """Current model snapshot, swapped atomically when the registry's CURRENT changes"""
+
+    def __init__(self, registry: ModelRegistry = None, poll_seconds: float = 5.0, telemetry=None):
+        self.registry = registry if registry is not None else ModelRegistry()
+        self.registry.ensure_bootstrapped()
+        self.poll_seconds = poll_seconds
+        # Optional app_pkg.telemetry.Telemetry; every actual load + warm-up is a "model.load" observation
+        self.telemetry = telemetry
+        self.last_error = None
+        self.swaps = 0
+        self._failed_version = None
+        self._listeners = []
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        version = self.registry.current_version()
+        if version is None:
+            raise FileNotFoundError("No model registered. Run the notebook to create models/final_model.pkl")
+        self._snapshot = self._load(version)
+        self._thread = None
+
+    def _load(self, version: str) -> ModelSnapshot:
+        with self.telemetry.stage("model.load") if self.telemetry is not None else nullcontext():
+            snapshot = self.registry.load(version)
+            warm_up(snapshot.model)
+        return snapshot
+
+    def get(self) -> ModelSnapshot:
+        """The live snapshot; hold on to it for the duration of one request"""
+        return self._snapshot
+
+    def on_swap(self, callback):
+        """Call ``callback(snapshot)`` after every successful switch"""
+        self._listeners.append(callback)
+
+    def check_now(self) -> bool:
+        """Load the registry's CURRENT if it differs from the live version; True if swapped"""
+        with self._reload_lock:
+            version = self.registry.current_version()
+            if version is None or version in (self._snapshot.version, self._failed_version):
+                return False
+            try:
+                snapshot = self._load(version)
+            except Exception as e:
+                # Keep serving the old model; a broken artifact must not take the app down
+                self.last_error = f"{version}: {e}"
+                self._failed_version = version
+                return False
+            self._snapshot = snapshot
+            self.swaps += 1
+            self.last_error = None
+            self._failed_version = None
+        for callback in self._listeners:
+            callback(snapshot)
+        return True
+
+    def start(self) -> "LiveModel":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._poll, name="model-registry-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_seconds):
+            self.check_now()
+
+
+def _forget_failed_prewarm(future: Future):
+    # A failed load is not kept around, so the next caller starts a fresh attempt
+    global _prewarm
+    if future.exception() is not None:
+        with _prewarm_lock:
+            if _prewarm is future:
+                _prewarm = None
+
+
+def prewarm_live_model(poll_seconds: float = 5.0) -> Future:
+    """Start loading the process-wide ``LiveModel`` on a background thread; later calls share it"""
+    global _prewarm
+    with _prewarm_lock:
+        future, started = _prewarm, False
+        if future is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-prewarm")
+            from app_pkg.telemetry import get_telemetry
+
+            future = _prewarm = executor.submit(LiveModel, poll_seconds=poll_seconds, telemetry=get_telemetry())
+            executor.shutdown(wait=False)
+            started = True
+    if started:
+        # Outside the lock: the callback runs right here if the load has already failed
+        future.add_done_callback(_forget_failed_prewarm)
+    return future
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage versioned model artifacts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show registered versions")
+    reg = sub.add_parser("register", help="Register a model file as a new version")
+    reg.add_argument("model")
+    reg.add_argument("metrics", nargs="?")
+    reg.add_argument("--version")
+    reg.add_argument("--promote", action="store_true")
+    pro = sub.add_parser("promote", help="Make a version live")
+    pro.add_argument("version")
+    sub.add_parser("rollback", help="Go back to the previously live version")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry()
+    registry.ensure_bootstrapped()
+    if args.command == "list":
+        current = registry.current_version()
+        for version in registry.list_versions():
+            print(("* " if version == current else "  ") + version)
+    elif args.command == "register":
+        version = registry.register(args.model, args.metrics, args.version)
+        if args.promote:
+            registry.promote(version)
+        print(f"Registered {version}" + (" (live)" if args.promote else ""))
+    elif args.command == "promote":
+        registry.promote(args.version)
+        print(f"Promoted {args.version}")
+    elif args.command == "rollback":
+        print(f"Rolled back to {registry.rollback()}")
+
+
+if __name__ == "__main__":
+    main()
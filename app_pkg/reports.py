@@ -0,0 +1,275 @@
+"""PDF reports for single predictions and multi-donor batches.
+
+Paragraph and table styles are built once per process and reused, so a
+report costs only its own layout. ``generate_bulk_pdf`` renders a summary
+page plus a paginated donor table for a whole scored batch.
+
+    python -m app_pkg.reports --donors 500   # per-donor time: loop vs bulk
+"""
+import argparse
+import io
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+AVAILABLE = "Available (Yes)"
+
+
+@lru_cache(maxsize=1)
+def _report_styles() -> dict:
+    """Paragraph and table styles shared by every report"""
+    styles = getSampleStyleSheet()
+    grid_table = [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ]
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            textColor=colors.darkblue,
+            alignment=1  # Center alignment
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=colors.darkred
+        ),
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=1
+        ),
+        "info_table": TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+        "input_table": TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.darkblue)] + grid_table),
+        "result_table": TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.darkred)] + grid_table),
+        "donor_table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ]),
+    }
+
+
+def _report_info(username: str, prefix: str) -> Table:
+    now = datetime.now()
+    info_table = Table([
+        ['Report Generated:', now.strftime('%Y-%m-%d %H:%M:%S')],
+        ['User:', username],
+        ['Prediction ID:', f"{prefix}-{now.strftime('%Y%m%d-%H%M%S')}"]
+    ], colWidths=[2*inch, 3*inch])
+    info_table.setStyle(_report_styles()["info_table"])
+    return info_table
+
+
+def _footer(story: list):
+    footer_style = _report_styles()["footer"]
+    story.append(Spacer(1, 50))
+    story.append(Paragraph("Generated by Donor Availability Predictor | Powered by Machine Learning", footer_style))
+    story.append(Paragraph("This report is for informational purposes only.", footer_style))
+
+
+def generate_prediction_pdf(input_data: dict, prediction_result: dict, username: str) -> bytes:
+    """Generate a PDF report with prediction inputs and outputs"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = _report_styles()
+    story = []
+
+    # Title and header
+    story.append(Paragraph("🩸 Donor Availability Prediction Report", styles["title"]))
+    story.append(Spacer(1, 20))
+    story.append(_report_info(username, "PRED"))
+    story.append(Spacer(1, 30))
+
+    # Input Data Section
+    story.append(Paragraph("📋 Input Data", styles["heading"]))
+
+    input_table_data = [['Field', 'Value']]
+    for key, value in input_data.items():
+        input_table_data.append([key, str(value)])
+
+    input_table = Table(input_table_data, colWidths=[2.5*inch, 3*inch])
+    input_table.setStyle(styles["input_table"])
+    story.append(input_table)
+    story.append(Spacer(1, 30))
+
+    # Prediction Results Section
+    story.append(Paragraph("🎯 Prediction Results", styles["heading"]))
+
+    result_color = colors.green if prediction_result['decision'] == AVAILABLE else colors.red
+
+    result_table = Table([
+        ['Metric', 'Value'],
+        ['Availability Probability', f"{prediction_result['probability']:.2f}%"],
+        ['Decision', prediction_result['decision']],
+        ['Model Used', prediction_result['model']]
+    ], colWidths=[2.5*inch, 3*inch])
+    result_table.setStyle(styles["result_table"])
+    # Color and bold the decision text
+    result_table.setStyle(TableStyle([
+        ('TEXTCOLOR', (1, 2), (1, 2), result_color),
+        ('FONTNAME', (1, 2), (1, 2), 'Helvetica-Bold')
+    ]))
+    story.append(result_table)
+    story.append(Spacer(1, 30))
+
+    _footer(story)
+
+    # Build PDF
+    doc.build(story)
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
+def _fmt(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "-"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def generate_bulk_pdf(scored: pd.DataFrame, username: str, model_name: str = "(unknown)") -> bytes:
+    """One report for a scored batch: summary page + paginated donor table.
+
+    ``scored`` is the output of ``app_pkg.batch.score_frame`` (raw donor
+    columns plus ``availability_probability`` and ``decision``).
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title="Donor Availability Batch Report")
+    styles = _report_styles()
+    story = []
+
+    proba = scored["availability_probability"].to_numpy(dtype=float)
+    available = scored["decision"].eq(AVAILABLE).to_numpy()
+    n = len(scored)
+
+    # Summary page
+    story.append(Paragraph("🩸 Donor Availability Batch Report", styles["title"]))
+    story.append(Spacer(1, 20))
+    story.append(_report_info(username, "BATCH"))
+    story.append(Spacer(1, 30))
+    story.append(Paragraph("📊 Summary", styles["heading"]))
+    summary_table = Table([
+        ['Metric', 'Value'],
+        ['Donors Scored', f"{n:,}"],
+        ['Predicted Available', f"{int(available.sum()):,} ({available.mean() * 100 if n else 0:.1f}%)"],
+        ['Mean Probability', f"{proba.mean() * 100 if n else 0:.2f}%"],
+        ['Model Used', model_name],
+    ], colWidths=[2.5*inch, 3*inch])
+    summary_table.setStyle(styles["result_table"])
+    story.append(summary_table)
+
+    if n and "blood_group" in scored.columns:
+        story.append(Spacer(1, 30))
+        story.append(Paragraph("🩸 Available Donors by Blood Group", styles["heading"]))
+        by_group = (pd.DataFrame({"group": scored["blood_group"].fillna("Unknown"), "available": available})
+                    .groupby("group")["available"].agg(["sum", "count"]))
+        group_table = Table(
+            [['Blood Group', 'Available', 'Donors']]
+            + [[g, f"{int(r['sum']):,}", f"{int(r['count']):,}"] for g, r in by_group.iterrows()],
+            colWidths=[2*inch, 1.75*inch, 1.75*inch],
+        )
+        group_table.setStyle(styles["input_table"])
+        story.append(group_table)
+    _footer(story)
+
+    # Donor table, split across pages with the header repeated
+    story.append(PageBreak())
+    story.append(Paragraph("📋 Donor Predictions", styles["heading"]))
+    id_col = "donor_id" if "donor_id" in scored.columns else None
+    header = ['#', 'Donor ID', 'City', 'Blood Group', 'Donations', 'Pints', 'Probability', 'Decision']
+    rows = [header]
+    cols = [id_col, "city", "blood_group", "number_of_donation", "pints_donated"]
+    values = [scored[c].tolist() if c in scored.columns else [None] * n for c in cols]
+    decision_colors = []
+    for i in range(n):
+        rows.append([str(i + 1)] + [_fmt(v[i]) for v in values]
+                    + [f"{proba[i] * 100:.2f}%", "Yes" if available[i] else "No"])
+        decision_colors.append(('TEXTCOLOR', (7, i + 1), (7, i + 1), colors.green if available[i] else colors.red))
+
+    donor_table = Table(rows, repeatRows=1,
+                        colWidths=[0.5*inch, 1*inch, 0.95*inch, 0.8*inch, 0.75*inch, 0.6*inch, 0.8*inch, 0.65*inch])
+    donor_table.setStyle(styles["donor_table"])
+    donor_table.setStyle(TableStyle(decision_colors))
+    story.append(donor_table)
+
+    doc.build(story)
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark single vs bulk PDF report generation")
+    parser.add_argument("--donors", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    from app_pkg.batch import score_frame
+    from app_pkg.paths import DATA_DIR, MODEL_PATH
+
+    df = pd.read_csv(DATA_DIR / "Blood_Donor_updated.csv", nrows=args.donors)
+    scored, _ = score_frame(joblib.load(MODEL_PATH), df)
+
+    def single_loop(rebuild_styles: bool) -> float:
+        t0 = time.perf_counter()
+        for row in scored.itertuples(index=False):
+            if rebuild_styles:
+                # What every call used to pay before styles were shared
+                _report_styles.cache_clear()
+            generate_prediction_pdf(
+                {"City": row.city, "Blood Group": row.blood_group,
+                 "Number of Donations": row.number_of_donation, "Pints Donated": row.pints_donated},
+                {"probability": row.availability_probability * 100, "decision": row.decision, "model": "bench"},
+                "bench",
+            )
+        return time.perf_counter() - t0
+
+    rebuilt_seconds = single_loop(rebuild_styles=True)
+    loop_seconds = single_loop(rebuild_styles=False)
+
+    t0 = time.perf_counter()
+    pdf = generate_bulk_pdf(scored, "bench", "bench")
+    bulk_seconds = time.perf_counter() - t0
+
+    n = len(scored)
+    print(f"Donors                 : {n}")
+    print(f"Single PDFs, old styles: {rebuilt_seconds:.2f}s ({rebuilt_seconds / n * 1000:.2f} ms/donor)")
+    print(f"Single PDFs in a loop  : {loop_seconds:.2f}s ({loop_seconds / n * 1000:.2f} ms/donor)")
+    print(f"One bulk report        : {bulk_seconds:.2f}s ({bulk_seconds / n * 1000:.2f} ms/donor, {len(pdf) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
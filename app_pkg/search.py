@@ -0,0 +1,203 @@
+"""Ranked search for compatible, likely-available donors.
+
+``DonorIndex`` scores every donor once with the live model and buckets the
+rows by (city, blood group), each bucket sorted by availability probability.
+A query for a recipient blood group only looks at the heads of the buckets
+that are ABO/Rh compatible, so it costs O(k x buckets) whatever the size of
+the donor table.
+
+    python -m app_pkg.search B- --city Perth -k 10
+
+``sync`` re-scores only rows that are new or changed since the last build
+(``refresh`` skips even that while the data source key is unchanged), and
+``rescore`` re-runs the batch scoring when a new model version goes live.
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.batch import score_frame
+from app_pkg.dataset import DEFAULT_CSV, load_donor_dataset
+from app_pkg.features import BLOOD_GROUPS, CITIES, RAW_COLUMNS
+
+# Donor blood groups a recipient can receive red cells from
+COMPATIBLE_DONORS = {
+    "O-": ["O-"],
+    "O+": ["O+", "O-"],
+    "A-": ["A-", "O-"],
+    "A+": ["A+", "A-", "O+", "O-"],
+    "B-": ["B-", "O-"],
+    "B+": ["B+", "B-", "O+", "O-"],
+    "AB-": ["AB-", "A-", "B-", "O-"],
+    "AB+": ["AB+", "AB-", "A+", "A-", "B+", "B-", "O+", "O-"],
+}
+RESULT_COLUMNS = ["donor_id", "city", "blood_group", "months_since_first_donation",
+                  "number_of_donation", "pints_donated", "created_at"]
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    raw = df[RAW_COLUMNS].astype(object).astype(str)
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+
+def _row_keys(df: pd.DataFrame, hashes: np.ndarray) -> np.ndarray:
+    """donor_id plus its occurrence number; rows without an id are keyed by their content"""
+    if "donor_id" in df.columns:
+        ids = df["donor_id"].astype(object).reset_index(drop=True)
+    else:
+        ids = pd.Series(np.nan, index=range(len(df)), dtype=object)
+    ids = ids.where(ids.notna(), "#" + pd.Series(hashes).astype(str))
+    return (ids.astype(str) + "/" + ids.groupby(ids).cumcount().astype(str)).to_numpy()
+
+
+class DonorIndex:
+    """Donor table with precomputed probabilities, bucketed by (city, blood group)"""
+
+    def __init__(self, donors: pd.DataFrame, model, version: str = None, source: str = None):
+        self.model = model
+        self.version = version
+        # Identifies the donor data last indexed (e.g. the dataset cache file name)
+        self.source = source
+        self.build_seconds = 0.0
+        self.rows_scored = 0
+        # Queries must not see a half-rebuilt index while sync/rescore run
+        self._lock = threading.RLock()
+        t0 = time.perf_counter()
+        self._set_rows(donors.reset_index(drop=True), self._score(donors))
+        self.build_seconds = time.perf_counter() - t0
+
+    def __len__(self) -> int:
+        return len(self.donors)
+
+    def _score(self, rows: pd.DataFrame) -> np.ndarray:
+        if len(rows) == 0:
+            return np.empty(0, dtype=np.float32)
+        scored, _ = score_frame(self.model, rows.reset_index(drop=True))
+        self.rows_scored += len(rows)
+        return scored["availability_probability"].to_numpy(dtype=np.float32)
+
+    def _set_rows(self, donors: pd.DataFrame, proba: np.ndarray):
+        self.donors = donors
+        self.proba = proba
+        self._hashes = _row_hashes(donors)
+        self._keys = _row_keys(donors, self._hashes)
+        city = donors["city"].astype(object).replace({"Others": "Unknown"})
+        city_codes = pd.Categorical(city, categories=CITIES).codes
+        group_codes = pd.Categorical(donors["blood_group"].astype(object), categories=BLOOD_GROUPS).codes
+
+        # One stable sort: by bucket, then probability descending within each bucket
+        order = np.lexsort((-proba, group_codes, city_codes))
+        bucket = (city_codes[order].astype(np.int64) + 1) * (len(BLOOD_GROUPS) + 1) + group_codes[order] + 1
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]]) if len(order) else np.empty(0, int)
+        stops = np.r_[starts[1:], len(order)]
+        self._order = order
+        self._buckets = {}
+        for start, stop in zip(starts, stops):
+            c, g = city_codes[order[start]], group_codes[order[start]]
+            if g >= 0:
+                # Donors with no recorded blood group can't be matched
+                self._buckets[(int(c), int(g))] = (start, stop)
+
+    def rescore(self, model, version: str = None) -> bool:
+        """Re-score every donor with a new model; no-op if ``version`` is already live"""
+        with self._lock:
+            if version is not None and version == self.version:
+                return False
+            self.model, self.version = model, version
+            self._set_rows(self.donors, self._score(self.donors))
+            return True
+
+    def sync(self, donors: pd.DataFrame) -> dict:
+        """Make the index match ``donors``, scoring only new or edited rows"""
+        with self._lock:
+            donors = donors.reset_index(drop=True)
+            hashes = _row_hashes(donors)
+            keys = _row_keys(donors, hashes)
+            previous = pd.Series(np.arange(len(self._keys)), index=self._keys)
+            old_pos = previous.reindex(keys).to_numpy()
+            known = ~np.isnan(old_pos)
+            old_pos = np.where(known, old_pos, 0).astype(np.int64)
+            unchanged = known & (self._hashes[old_pos] == hashes) if len(self._keys) else np.zeros(len(keys), bool)
+
+            proba = np.empty(len(donors), dtype=np.float32)
+            proba[unchanged] = self.proba[old_pos[unchanged]]
+            changed = np.flatnonzero(~unchanged)
+            proba[changed] = self._score(donors.iloc[changed])
+            removed = len(self._keys) - int(known.sum())
+            self._set_rows(donors, proba)
+            return {"rows": len(donors), "rescored": len(changed), "removed": removed}
+
+    def refresh(self, source: str, load) -> dict:
+        """``sync(load())`` only when ``source`` differs from the data last indexed"""
+        with self._lock:
+            if source == self.source:
+                return {"rows": len(self.donors), "rescored": 0, "removed": 0}
+            stats = self.sync(load())
+            self.source = source
+            return stats
+
+    def query(self, blood_group: str, city: str = None, k: int = 10,
+              min_probability: float = 0.0) -> pd.DataFrame:
+        """Top-``k`` compatible donors for a recipient, most likely available first"""
+        if blood_group not in COMPATIBLE_DONORS:
+            raise ValueError(f"Unknown blood group: {blood_group}")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if city == "Others":
+            city = "Unknown"
+        if city and city not in CITIES:
+            raise ValueError(f"Unknown city: {city}")
+        cities = [CITIES.index(city)] if city else list(range(-1, len(CITIES)))
+        groups = [BLOOD_GROUPS.index(g) for g in COMPATIBLE_DONORS[blood_group]]
+
+        with self._lock:
+            # Each bucket is sorted, so only its first k rows can make the top k
+            heads = [self._order[start:min(stop, start + k)]
+                     for start, stop in (self._buckets.get((c, g), (0, 0)) for c in cities for g in groups)]
+            candidates = np.concatenate(heads) if heads else np.empty(0, dtype=np.int64)
+            candidates = candidates[self.proba[candidates] >= min_probability]
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-self.proba[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-self.proba[candidates], kind="stable")]
+
+            columns = [c for c in RESULT_COLUMNS if c in self.donors.columns]
+            result = self.donors.iloc[candidates][columns].reset_index(drop=True)
+            result["availability_probability"] = self.proba[candidates]
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank compatible donors for a recipient blood group")
+    parser.add_argument("blood_group", choices=list(COMPATIBLE_DONORS), help="Recipient blood group")
+    parser.add_argument("--city", help="Restrict to one city (default: all)")
+    parser.add_argument("-k", type=int, default=10, help="Number of donors to return")
+    parser.add_argument("--data", default=str(DEFAULT_CSV))
+    parser.add_argument("--model", help="Path to a fitted pipeline (default: the registry's live version)")
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    if args.model:
+        model, version = joblib.load(args.model), args.model
+    else:
+        from app_pkg.registry import ModelRegistry
+
+        registry = ModelRegistry()
+        registry.ensure_bootstrapped()
+        snapshot = registry.load(registry.current_version())
+        model, version = snapshot.model, snapshot.version
+
+    index = DonorIndex(load_donor_dataset(args.data), model, version)
+    t0 = time.perf_counter()
+    result = index.query(args.blood_group, args.city, args.k)
+    query_ms = (time.perf_counter() - t0) * 1000
+
+    print(result.to_string(index=False))
+    print(f"Indexed {len(index):,} donors in {index.build_seconds:.2f}s (model {version}) | query {query_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
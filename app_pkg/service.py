@@ -0,0 +1,286 @@
+"""Standalone HTTP scoring service with request micro-batching.
+
+Serves the model registry's live version (bootstrapped from
+``models/final_model.pkl`` on first use), hot-swapping on promote/rollback:
+
+- ``POST /predict`` with one donor object or an array of them (same fields the
+  sidebar collects, see ``app_pkg.features.RAW_COLUMNS``)
+- ``GET /health``
+
+Requests that arrive together are grouped by ``MicroBatcher`` into a single
+``predict_proba`` call. Run with::
+
+    python -m app_pkg.service --port 8000 --max-batch-size 64 --max-wait-ms 5
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from app_pkg.features import RAW_COLUMNS, derive_features
+from app_pkg.thresholds import ThresholdTable
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+def clean_record(record: dict) -> dict:
+    """The raw donor fields of one request object; anything but a scalar is a ValueError (HTTP 400)"""
+    cleaned = {}
+    for col in RAW_COLUMNS:
+        value = record.get(col)
+        # bool is an int subclass, but true/false is never a valid donor field
+        if isinstance(value, bool) or (value is not None and not isinstance(value, (str, int, float))):
+            raise ValueError(f"Field '{col}' must be a string, number or null, got {type(value).__name__}")
+        cleaned[col] = value
+    return cleaned
+
+
+class MicroBatcher:
+    """Collects concurrent scoring requests and runs them as one batch.
+
+    The worker thread blocks for the first request, then keeps collecting
+    until ``max_batch_size`` rows are queued or ``max_wait_ms`` has passed.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, records: list) -> Future:
+        """Queue records for scoring; the future resolves to their probabilities"""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((records, future))
+        return future
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the sentinel back so the run loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            records = [r for recs, _ in batch for r in recs]
+            try:
+                proba = self.predict_fn(records)
+            except Exception as e:
+                self._run_separately(batch, e)
+                continue
+            self.batches += 1
+            self.rows += len(records)
+            start = 0
+            for recs, future in batch:
+                future.set_result(proba[start:start + len(recs)])
+                start += len(recs)
+
+    def _run_separately(self, batch: list, error: Exception):
+        """A failed batch is retried one request at a time so only the bad request fails"""
+        if len(batch) == 1:
+            batch[0][1].set_exception(error)
+            return
+        for recs, future in batch:
+            try:
+                proba = self.predict_fn(recs)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(recs)
+            future.set_result(proba)
+
+
+class ScoringService:
+    """Owns the model and the micro-batcher behind the HTTP handler.
+
+    Follows the model registry (an ``app_pkg.registry.LiveModel``, started
+    here unless one is passed in), so each batch uses whichever version is
+    live. Passing ``model`` serves that fixed model instead.
+    """
+
+    def __init__(self, model=None, metrics: dict = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, live_model=None):
+        self._owns_live_model = False
+        if live_model is None and model is None:
+            from app_pkg.registry import LiveModel
+
+            live_model = LiveModel().start()
+            self._owns_live_model = True
+        self.live_model = live_model
+        if live_model is None and metrics is None:
+            metrics = {}
+        self._model = model
+        self._metrics = metrics
+        self._thresholds = None
+        self.batcher = MicroBatcher(self._predict, max_batch_size, max_wait_ms)
+
+    @property
+    def model(self):
+        return self.live_model.get().model if self.live_model is not None else self._model
+
+    @property
+    def metrics(self) -> dict:
+        return self.live_model.get().metrics if self.live_model is not None else self._metrics
+
+    @property
+    def thresholds(self) -> ThresholdTable:
+        """Decision thresholds of the current metrics, rebuilt only when the metrics change"""
+        metrics = self.metrics
+        cached = self._thresholds
+        if cached is None or cached[0] is not metrics:
+            cached = self._thresholds = (metrics, ThresholdTable.from_metrics(metrics))
+        return cached[1]
+
+    def _predict(self, records: list) -> np.ndarray:
+        return self.model.predict_proba(derive_features(records))[:, 1]
+
+    def score(self, payload) -> dict:
+        """Score a single donor object or a list of them"""
+        single = isinstance(payload, dict)
+        records = [payload] if single else payload
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            raise ValueError("Payload must be a JSON object or an array of objects")
+        records = [clean_record(r) for r in records]
+        if not records:
+            return {"model": self.metrics.get("model", "(unknown)"), "predictions": []}
+
+        proba = self.batcher.submit(records).result()
+        thresholds = self.thresholds
+        predictions = [{
+            "probability": float(p),
+            "decision": "Available (Yes)" if p >= thresholds.lookup(r) else "Not Available (No)",
+        } for p, r in zip(proba, records)]
+        result = {"model": self.metrics.get("model", "(unknown)")}
+        if single:
+            result.update(predictions[0])
+        else:
+            result["predictions"] = predictions
+        return result
+
+    def close(self):
+        self.batcher.close()
+        if self._owns_live_model:
+            self.live_model.stop()
+
+
+def make_handler(service: ScoringService):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {
+                    "status": "ok",
+                    "model": service.metrics.get("model", "(unknown)"),
+                    "version": service.metrics.get("version"),
+                    "batches": service.batcher.batches,
+                    "rows": service.batcher.rows,
+                })
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "Not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                self._send_json(200, service.score(payload))
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+            except Exception as e:
+                self._send_json(500, {"error": f"Prediction failed: {e}"})
+
+        def log_message(self, format, *args):
+            # Keep the console quiet under load
+            pass
+
+    return ScoringHandler
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 drops connections under bursty load
+    request_queue_size = 128
+
+
+def make_server(service: ScoringService, host: str = "127.0.0.1", port: int = 8000) -> ScoringServer:
+    return ScoringServer((host, port), make_handler(service))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Donor availability HTTP scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument("--model", help="Serve this model file instead of following the registry")
+    parser.add_argument("--metrics", help="With --model: its metrics.json (thresholds, model name)")
+    args = parser.parse_args(argv)
+
+    model = metrics = None
+    if args.model:
+        import joblib
+
+        model = joblib.load(args.model)
+        metrics = json.loads(Path(args.metrics).read_text()) if args.metrics else {}
+    service = ScoringService(model, metrics, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    server = make_server(service, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port} "
+          f"(max batch {args.max_batch_size}, max wait {args.max_wait_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Cold-start timings for the Streamlit app.
+
+Every scenario runs in a fresh interpreter, so nothing is already imported:
+
+* ``eager_imports``   - every module ``app.py`` used to import before drawing anything
+* ``landing_imports`` - what the sign-in/landing screens import now
+* ``prewarm_return``  - landing imports plus starting the background model load
+* ``model_ready``     - registry model loaded and warmed (what the prewarm thread does)
+
+    python -m app_pkg.startup --repeat 5
+    python -m app_pkg.startup --json > startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from app_pkg.paths import ROOT_DIR
+
+SCENARIOS = {
+    "eager_imports": (
+        "import numpy, pandas\n"
+        "import app_pkg.batch, app_pkg.cache, app_pkg.fastpath, app_pkg.features\n"
+        "import app_pkg.registry, app_pkg.reports, app_pkg.search, app_pkg.auth\n"
+    ),
+    "landing_imports": "import app_pkg.registry, app_pkg.auth\n",
+    "prewarm_return": "import app_pkg.registry, app_pkg.auth\napp_pkg.registry.prewarm_live_model()\n",
+    "model_ready": "import app_pkg.registry\napp_pkg.registry.prewarm_live_model().result()\n",
+}
+
+_TIMER = "import time\n_t0 = time.perf_counter()\n{body}print(time.perf_counter() - _t0)\n"
+
+
+def time_scenario(body: str, repeat: int = 3) -> list:
+    """Seconds spent in ``body`` in ``repeat`` fresh interpreters"""
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _TIMER.format(body=body)],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app import and model start-up time in fresh interpreters")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.scenarios:
+        samples = time_scenario(SCENARIOS[name], args.repeat)
+        results[name] = {"median_ms": statistics.median(samples) * 1000, "min_ms": min(samples) * 1000,
+                         "samples_ms": [s * 1000 for s in samples]}
+        if not args.json:
+            print(f"{name:16s}: median {results[name]['median_ms']:8.1f} ms | min {results[name]['min_ms']:8.1f} ms")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Streaming, chunked scoring of donor files larger than memory.
+
+Reads the input CSV ``--chunk-size`` rows at a time, derives features and
+scores each chunk with the saved pipeline, and appends it to the output
+before reading the next one, so memory stays flat whatever the file size.
+
+    python -m app_pkg.stream registry.csv -o scored.csv --chunk-size 50000
+    python -m app_pkg.stream registry.csv -o scored.csv --resume
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app_pkg.batch import DEFAULT_CHUNK_SIZE, score_frame
+
+
+def completed_rows(output: Path) -> int:
+    """Count fully written data rows in ``output``, dropping a trailing partial line"""
+    if not output.exists() or output.stat().st_size == 0:
+        return 0
+    lines = 0
+    last_newline = -1
+    offset = 0
+    with open(output, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            pos = block.rfind(b"\n")
+            if pos >= 0:
+                last_newline = offset + pos
+            offset += len(block)
+    if last_newline + 1 < offset:
+        # A crash mid-write left half a row behind
+        with open(output, "r+b") as f:
+            f.truncate(last_newline + 1)
+    return max(lines - 1, 0)
+
+
+def stream_score(model, input_path, output_path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 start_row: int = 0, threshold: float = 0.5, progress=None) -> dict:
+    """Score ``input_path`` chunk by chunk from data row ``start_row`` and append to ``output_path``"""
+    output_path = Path(output_path)
+    write_header = start_row == 0 or not output_path.exists() or output_path.stat().st_size == 0
+    mode = "w" if start_row == 0 else "a"
+
+    reader = pd.read_csv(
+        input_path,
+        chunksize=chunk_size,
+        skiprows=range(1, start_row + 1) if start_row else None,
+    )
+    rows = 0
+    start = time.perf_counter()
+    with open(output_path, mode, newline="") as out:
+        for chunk in reader:
+            scored, _ = score_frame(model, chunk, chunk_size=chunk_size, threshold=threshold)
+            scored.to_csv(out, header=write_header, index=False)
+            out.flush()
+            os.fsync(out.fileno())
+            write_header = False
+            rows += len(chunk)
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress(start_row + rows, rows / elapsed if elapsed else float("inf"))
+
+    elapsed = time.perf_counter() - start
+    return {
+        "start_row": start_row,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else float("inf"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a large donor CSV through the model in chunks")
+    parser.add_argument("input", help="CSV with the raw donor columns")
+    parser.add_argument("-o", "--output", required=True, help="Scored CSV to write (appended on resume)")
+    parser.add_argument("--model", help="Path to the fitted pipeline (default: the live registry version)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--threshold", type=float,
+                        help="Fixed decision threshold (default: the live model's calibrated thresholds)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--start-row", type=int, default=0, help="Skip this many data rows of the input")
+    group.add_argument("--resume", action="store_true", help="Continue after the rows already in --output")
+    args = parser.parse_args(argv)
+
+    import joblib
+
+    from app_pkg.registry import ModelRegistry
+    from app_pkg.thresholds import live_thresholds
+
+    model = joblib.load(args.model or ModelRegistry().live_paths()[0])
+    threshold = live_thresholds() if args.threshold is None else args.threshold
+    start_row = completed_rows(Path(args.output)) if args.resume else args.start_row
+    if start_row:
+        print(f"Resuming from data row {start_row:,}", file=sys.stderr)
+
+    def progress(done: int, rate: float):
+        print(f"\r{done:,} rows scored ({rate:,.0f} rows/sec)", end="", file=sys.stderr, flush=True)
+
+    stats = stream_score(model, args.input, args.output, args.chunk_size, start_row, threshold, progress)
+    print(file=sys.stderr)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/sec) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Per-stage latency timers and counters for the app and the auth pages.
+
+Every stage keeps a cumulative Prometheus-style histogram plus a window of
+recent samples for p50/p95/p99::
+
+    telemetry = get_telemetry()
+    with telemetry.request("predict"):          # profiled if slow
+        with telemetry.stage("predict.model"):
+            ...
+    telemetry.incr("predictions")
+
+``prometheus_text()`` renders everything in the Prometheus exposition
+format and ``start_json_export()`` writes a JSON snapshot every few seconds.
+The process-wide instance from ``get_telemetry()`` is configured from the
+environment:
+
+    DONOR_APP_TELEMETRY_JSON=metrics/telemetry.json   # periodic JSON export
+    DONOR_APP_TELEMETRY_INTERVAL=30                   # seconds between exports
+    DONOR_APP_PROFILE_SLOW_MS=500                     # dump cProfile stats for slower requests
+
+    python -m app_pkg.telemetry metrics/telemetry.json   # print an exported snapshot
+"""
+import argparse
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from app_pkg.paths import ROOT_DIR, atomic_write
+
+PROFILE_DIR = ROOT_DIR / "profiles"
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_PREFIX = "donor_app"
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def _percentile(values: list, q: float):
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+def _ms(seconds):
+    return seconds * 1000 if seconds is not None else None
+
+
+class _Stage:
+    def __init__(self, window: int, buckets: tuple):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+class Telemetry:
+    """Thread-safe stage histograms, counters and optional slow-request profiling"""
+
+    def __init__(self, window: int = 1000, buckets: tuple = BUCKETS,
+                 profile_slow_ms: float = None, profile_dir: Path = PROFILE_DIR):
+        self.window = window
+        self.buckets = tuple(buckets)
+        self.profile_slow_ms = profile_slow_ms
+        self.profile_dir = Path(profile_dir)
+        self.profiles_written = 0
+        self._stages = {}
+        self._counters = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+        self._export_thread = None
+        self._stop = threading.Event()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = _Stage(self.window, self.buckets)
+            stage.observe(seconds)
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the block under ``name``; an exception counts as an error for that stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @contextmanager
+    def request(self, name: str):
+        """A top-level stage; with ``profile_slow_ms`` set, slow runs leave a ``.prof`` file behind"""
+        profiler = None
+        if self.profile_slow_ms is not None:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another request on another thread is already being profiled
+                profiler = None
+        start = time.perf_counter()
+        try:
+            with self.stage(name):
+                yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if elapsed_ms >= self.profile_slow_ms:
+                    self.profile_dir.mkdir(parents=True, exist_ok=True)
+                    profiler.dump_stats(self.profile_dir / f"{name}-{int(time.time() * 1000)}-{elapsed_ms:.0f}ms.prof")
+                    with self._lock:
+                        self.profiles_written += 1
+
+    def snapshot(self) -> dict:
+        """Per-stage count/mean/p50/p95/p99/max in milliseconds, counters and error counts"""
+        with self._lock:
+            stages = {name: (s.count, s.total, s.max, sorted(s.recent)) for name, s in self._stages.items()}
+            counters = dict(self._counters)
+            errors = dict(self._errors)
+            profiles = self.profiles_written
+        return {
+            "timestamp": int(time.time()),
+            "stages": {
+                name: {
+                    "count": count,
+                    "mean_ms": total / count * 1000 if count else None,
+                    "p50_ms": _ms(_percentile(recent, 0.50)),
+                    "p95_ms": _ms(_percentile(recent, 0.95)),
+                    "p99_ms": _ms(_percentile(recent, 0.99)),
+                    "max_ms": peak * 1000,
+                }
+                for name, (count, total, peak, recent) in sorted(stages.items())
+            },
+            "counters": counters,
+            "errors": errors,
+            "profiles_written": profiles,
+        }
+
+    def prometheus_text(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """All stages and counters in the Prometheus text exposition format"""
+        with self._lock:
+            stages = {name: (list(s.bucket_counts), s.count, s.total, sorted(s.recent))
+                      for name, s in sorted(self._stages.items())}
+            counters = sorted(self._counters.items())
+            errors = sorted(self._errors.items())
+
+        lines = [f"# HELP {prefix}_stage_seconds Latency of each app stage",
+                 f"# TYPE {prefix}_stage_seconds histogram"]
+        for name, (bucket_counts, count, total, _) in stages.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets, bucket_counts):
+                cumulative += n
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {count}')
+
+        lines += [f"# HELP {prefix}_stage_recent_seconds Latency quantiles over the last {self.window} runs of each stage",
+                  f"# TYPE {prefix}_stage_recent_seconds summary"]
+        for name, (_, count, total, recent) in stages.items():
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'{prefix}_stage_recent_seconds{{stage="{name}",quantile="{q}"}} {_percentile(recent, q):.6f}')
+
+        for name, value in counters:
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {value}"]
+        lines += [f"# TYPE {prefix}_errors_total counter"]
+        lines += [f'{prefix}_errors_total{{stage="{name}"}} {value}' for name, value in errors]
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(self.snapshot(), indent=2))
+
+    def start_json_export(self, path, interval_seconds: float = 30.0) -> "Telemetry":
+        """Write ``snapshot()`` to ``path`` every ``interval_seconds`` from a daemon thread"""
+        if self._export_thread is None:
+            def run():
+                while not self._stop.wait(interval_seconds):
+                    self.write_json(path)
+
+            self._export_thread = threading.Thread(target=run, name="telemetry-export", daemon=True)
+            self._export_thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._export_thread is not None:
+            self._export_thread.join()
+            self._export_thread = None
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide instance shared by the app and the auth pages"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            slow_ms = os.environ.get("DONOR_APP_PROFILE_SLOW_MS")
+            _default = Telemetry(profile_slow_ms=float(slow_ms) if slow_ms else None)
+            export_path = os.environ.get("DONOR_APP_TELEMETRY_JSON")
+            if export_path:
+                _default.start_json_export(export_path, float(os.environ.get("DONOR_APP_TELEMETRY_INTERVAL", 30)))
+    return _default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a telemetry snapshot exported by the app")
+    parser.add_argument("snapshot", help="JSON file written by DONOR_APP_TELEMETRY_JSON")
+    args = parser.parse_args(argv)
+
+    snapshot = json.loads(Path(args.snapshot).read_text())
+    print(f"{'stage':24s} {'count':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for name, s in snapshot["stages"].items():
+        print(f"{name:24s} {s['count']:7d} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['p99_ms']:9.2f} {s['max_ms']:9.2f}")
+    for name, value in sorted(snapshot["counters"].items()):
+        print(f"{name}: {value}")
+    for name, value in sorted(snapshot["errors"].items()):
+        print(f"errors[{name}]: {value}")
+
+
+if __name__ == "__main__":
+    main()
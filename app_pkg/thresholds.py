@@ -0,0 +1,247 @@
+"""Decision-threshold calibration and lookup.
+
+``threshold_curve`` sorts the scores once and uses cumulative sums of the
+labels to get TP/FP/FN/TN at every distinct cut point, so choosing the
+threshold that maximises F1 (or Youden's J) is O(n log n) instead of
+re-scoring at every candidate. Thresholds can also be fitted per city, per
+blood group or per city x blood group; cohorts with too few rows (or only
+one class) fall back to the global value.
+
+The result is stored in the model's ``metrics.json`` (``threshold`` plus a
+``thresholds`` block) and ``ThresholdTable`` turns it into a dict lookup
+for serving. By default the live registry model is calibrated and the new
+thresholds go live as a new registry version holding the same model, which
+is what the app, the service and the batch/stream CLIs read.
+
+    python -m app_pkg.thresholds                        # live model -> new live registry version
+    python -m app_pkg.thresholds --by city blood_group --min-rows 100
+    python -m app_pkg.thresholds --by city --no-promote # register without making it live
+    python -m app_pkg.thresholds --model m.pkl --metrics m.json   # update a metrics file instead
+"""
+import argparse
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app_pkg.paths import METRICS_PATH, MODEL_PATH
+
+GROUP_COLUMNS = ["city", "blood_group"]
+DEFAULT_THRESHOLD = 0.5
+KEY_SEPARATOR = "|"
+METRICS = ("f1_macro", "f1", "youden")
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    return np.divide(num, den, out=np.zeros(len(num)), where=den > 0)
+
+
+def threshold_curve(y, scores) -> tuple:
+    """(thresholds, tp, fp, fn, tn) for every distinct cut, predicting positive when score >= threshold"""
+    y = np.asarray(y, dtype=np.int64)
+    scores = np.asarray(scores, dtype=float)
+    order = np.argsort(-scores, kind="mergesort")
+    s, labels = scores[order], y[order]
+    tp = np.cumsum(labels)
+    fp = np.cumsum(1 - labels)
+    # Cut only after the last of a run of tied scores
+    last = np.r_[s[1:] != s[:-1], True]
+    distinct, tp, fp = s[last], tp[last], fp[last]
+    # Midway between neighbouring scores generalises better than the score itself
+    cuts = np.r_[(distinct[:-1] + distinct[1:]) / 2, distinct[-1]]
+    # Plus the "nobody is available" cut above the highest score
+    cuts = np.r_[np.nextafter(distinct[0], np.inf), cuts]
+    tp, fp = np.r_[0, tp], np.r_[0, fp]
+    positives, negatives = tp[-1], fp[-1]
+    return cuts, tp, fp, positives - tp, negatives - fp
+
+
+def _objective(metric: str, tp, fp, fn, tn) -> np.ndarray:
+    f1_pos = _ratio(2 * tp, 2 * tp + fp + fn)
+    if metric == "f1":
+        return f1_pos
+    if metric == "f1_macro":
+        return (f1_pos + _ratio(2 * tn, 2 * tn + fn + fp)) / 2
+    if metric == "youden":
+        return _ratio(tp, tp + fn) - _ratio(fp, fp + tn)
+    raise ValueError(f"Unknown threshold metric: {metric}")
+
+
+def metric_at(y, scores, threshold: float, metric: str = "f1_macro") -> float:
+    """``metric`` for one fixed threshold"""
+    y = np.asarray(y, dtype=bool)
+    pred = np.asarray(scores) >= threshold
+    counts = [np.array([np.sum(a & b)]) for a, b in ((pred, y), (pred, ~y), (~pred, y), (~pred, ~y))]
+    return float(_objective(metric, *counts)[0])
+
+
+def best_threshold(y, scores, metric: str = "f1_macro") -> tuple:
+    """(threshold, metric value) maximising ``metric`` over every distinct cut"""
+    cuts, tp, fp, fn, tn = threshold_curve(y, scores)
+    values = _objective(metric, tp, fp, fn, tn)
+    best = int(np.argmax(values))
+    return float(cuts[best]), float(values[best])
+
+
+def _group_keys(df: pd.DataFrame, by: list) -> pd.Series:
+    parts = []
+    for col in by:
+        values = df[col].astype(object)
+        if col == "city":
+            values = values.replace({"Others": "Unknown"})
+        parts.append(values.replace({"": np.nan}))
+    keys = parts[0].astype(str)
+    for part in parts[1:]:
+        keys = keys + KEY_SEPARATOR + part.astype(str)
+    # Any missing component means no cohort-specific threshold applies
+    missing = pd.concat(parts, axis=1).isna().any(axis=1)
+    return keys.where(~missing)
+
+
+def calibrate(y, scores, groups: pd.DataFrame = None, by: list = (), metric: str = "f1_macro",
+              min_rows: int = 200) -> "ThresholdTable":
+    """Global threshold plus one per cohort of ``by`` columns with at least ``min_rows`` rows of both classes"""
+    y = np.asarray(y, dtype=np.int64)
+    scores = np.asarray(scores, dtype=float)
+    default, score = best_threshold(y, scores, metric)
+    values, cohort_scores = {}, {}
+    if by:
+        keys = _group_keys(groups.reset_index(drop=True), list(by)).to_numpy()
+        frame = pd.DataFrame({"key": keys, "y": y, "score": scores}).dropna(subset=["key"])
+        for key, part in frame.groupby("key", sort=True):
+            labels = part["y"].to_numpy()
+            if len(part) < min_rows or labels.min() == labels.max():
+                continue
+            values[key], cohort_scores[key] = best_threshold(labels, part["score"].to_numpy(), metric)
+    return ThresholdTable(default, by, values, metric=metric, score=score,
+                          min_rows=min_rows, cohort_scores=cohort_scores)
+
+
+def live_thresholds() -> "ThresholdTable":
+    """Thresholds stored with the registry's live model"""
+    from app_pkg.registry import ModelRegistry
+
+    _, metrics_path = ModelRegistry().live_paths()
+    metrics = json.loads(Path(metrics_path).read_text()) if Path(metrics_path).exists() else {}
+    return ThresholdTable.from_metrics(metrics)
+
+
+class ThresholdTable:
+    """Global decision threshold with optional per-cohort overrides; lookups are one dict ``get``"""
+
+    def __init__(self, default: float = DEFAULT_THRESHOLD, by=(), values: dict = None,
+                 metric: str = None, score: float = None, min_rows: int = None, cohort_scores: dict = None):
+        self.default = float(default)
+        self.by = list(by)
+        self.values = {k: float(v) for k, v in (values or {}).items()}
+        self.metric = metric
+        self.score = score
+        self.min_rows = min_rows
+        self.cohort_scores = cohort_scores or {}
+
+    @classmethod
+    def from_metrics(cls, metrics: Mapping) -> "ThresholdTable":
+        block = metrics.get("thresholds") or {}
+        # 0.0 is a valid threshold, only a missing one falls back to the default
+        default = metrics.get("threshold")
+        return cls(DEFAULT_THRESHOLD if default is None else default, block.get("by", ()), block.get("values"),
+                   metric=block.get("metric"), min_rows=block.get("min_rows"))
+
+    def to_metrics(self) -> dict:
+        """``threshold``/``thresholds`` entries for metrics.json"""
+        return {
+            "threshold": self.default,
+            "thresholds": {"by": self.by, "metric": self.metric, "min_rows": self.min_rows, "values": self.values},
+        }
+
+    def lookup(self, record: Mapping) -> float:
+        """Threshold for one raw donor record"""
+        if not self.values:
+            return self.default
+        parts = []
+        for col in self.by:
+            value = record.get(col)
+            if col == "city" and value == "Others":
+                value = "Unknown"
+            if value is None or value == "" or (isinstance(value, float) and np.isnan(value)):
+                return self.default
+            parts.append(str(value))
+        return self.values.get(KEY_SEPARATOR.join(parts), self.default)
+
+    def for_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Per-row thresholds for a frame with the raw ``city``/``blood_group`` columns"""
+        if not self.values:
+            return np.full(len(df), self.default)
+        keys = _group_keys(df, self.by)
+        return keys.map(self.values).fillna(self.default).to_numpy(dtype=float)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate decision thresholds and store them with the model's metrics")
+    parser.add_argument("--by", nargs="+", choices=GROUP_COLUMNS, default=[], help="Fit per-cohort thresholds")
+    parser.add_argument("--metric", choices=METRICS, default="f1_macro")
+    parser.add_argument("--min-rows", type=int, default=200, help="Smallest cohort that gets its own threshold")
+    parser.add_argument("--all-rows", action="store_true",
+                        help="Calibrate on every cleaned row instead of the 20%% holdout the model was not fitted on")
+    parser.add_argument("--model", help="Calibrate this model file instead of the live registry version")
+    parser.add_argument("--metrics", help="With --model: metrics.json to update instead of registering a version")
+    parser.add_argument("--no-promote", action="store_true",
+                        help="Register the new version without making it live")
+    args = parser.parse_args(argv)
+
+    import warnings
+
+    import joblib
+
+    from app_pkg.features import derive_features
+    from app_pkg.registry import ModelRegistry
+    from app_pkg.train import TARGET, encode_target, holdout_split, load_clean_frame
+
+    warnings.filterwarnings("ignore")
+    registry = None
+    if args.model or args.metrics:
+        model_path = Path(args.model or MODEL_PATH)
+        metrics_path = Path(args.metrics or METRICS_PATH)
+    else:
+        # The live version, so the thresholds belong to the model that is actually serving
+        registry = ModelRegistry()
+        model_path, metrics_path = registry.live_paths()
+    metrics = json.loads(metrics_path.read_text()) if metrics_path.exists() else {}
+    df, _ = load_clean_frame()
+    y = encode_target(df[TARGET]).to_numpy()
+    if not args.all_rows:
+        # The rows the model's training run held out, so the scores are out-of-sample;
+        # metrics written before they were recorded get the same split rebuilt
+        holdout = metrics.get("holdout") or {}
+        if holdout.get("rows", len(df)) != len(df):
+            parser.error(f"the cleaned data has {len(df):,} rows but the model was trained on "
+                         f"{holdout['rows']:,}; use --all-rows or retrain")
+        test_idx = holdout["index"] if "index" in holdout else holdout_split(y)[1]
+        df, y = df.iloc[test_idx], y[test_idx]
+    df = df.reset_index(drop=True)
+    scores = joblib.load(model_path).predict_proba(derive_features(df))[:, 1]
+
+    table = calibrate(y, scores, df, args.by, args.metric, args.min_rows)
+    base_score = metric_at(y, scores, DEFAULT_THRESHOLD, args.metric)
+    print(f"Global threshold {table.default:.4f}: {args.metric} {table.score:.4f} (0.5 gives {base_score:.4f}) on {len(y):,} rows")
+    for key, value in table.values.items():
+        print(f"  {key:20s} {value:.4f}  {args.metric} {table.cohort_scores[key]:.4f}")
+
+    metrics.update(table.to_metrics())
+    if registry is None:
+        metrics_path.write_text(json.dumps(metrics, indent=2))
+        print(f"Updated {metrics_path}")
+        return
+    previous = metrics.pop("version", None)
+    version = registry.register(model_path, metrics)
+    if args.no_promote:
+        print(f"Registered {version} (model of {previous}); promote it with: python -m app_pkg.registry promote {version}")
+    else:
+        registry.promote(version)
+        print(f"Registered and promoted {version} (model of {previous})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Let the tests import app_pkg whichever directory pytest is started from
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
@@ -0,0 +1,84 @@
+import math
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from app_pkg.dataset import DEFAULT_CSV
+from app_pkg.fastpath import FastPredictor, check_parity
+from app_pkg.features import RAW_COLUMNS, derive_features, derive_record
+from app_pkg.paths import MODEL_PATH
+
+ATOL = 1e-9
+
+# Rows the dataset has few or none of: unseen and blank categories, missing and
+# zero counts, unparseable and timestamped dates
+EDGE_RECORDS = [
+    {"city": "Atlantis", "blood_group": "B-", "months_since_first_donation": 12,
+     "number_of_donation": 4, "pints_donated": 4, "created_at": "2021-06-01"},
+    {"city": "Perth", "blood_group": "Z+", "months_since_first_donation": 3,
+     "number_of_donation": 1, "pints_donated": 1, "created_at": "2020-01-31"},
+    {"city": "Others", "blood_group": "O+", "months_since_first_donation": 0,
+     "number_of_donation": 0, "pints_donated": 0, "created_at": "2019-12-01 00:00:00"},
+    {"city": "", "blood_group": None, "months_since_first_donation": math.nan,
+     "number_of_donation": 7, "pints_donated": None, "created_at": "not a date"},
+    {"city": None, "blood_group": "", "months_since_first_donation": None,
+     "number_of_donation": None, "pints_donated": None, "created_at": None},
+    {"city": "Sydney", "blood_group": "AB+", "months_since_first_donation": "24",
+     "number_of_donation": "6", "pints_donated": "6.5", "created_at": ""},
+]
+
+
+@pytest.fixture(scope="module")
+def pipe():
+    return joblib.load(MODEL_PATH)
+
+
+@pytest.fixture(scope="module")
+def fast(pipe):
+    return FastPredictor.from_pipeline(pipe)
+
+
+@pytest.fixture(scope="module")
+def donors():
+    return pd.read_csv(DEFAULT_CSV)
+
+
+def _pipeline_proba(pipe, records) -> np.ndarray:
+    return pipe.predict_proba(derive_features(records))[:, 1]
+
+
+def test_vectorized_matches_pipeline_on_dataset(pipe, fast, donors):
+    X = derive_features(donors)
+    np.testing.assert_allclose(fast.predict_proba(X)[:, 1], pipe.predict_proba(X)[:, 1], rtol=0, atol=ATOL)
+
+
+def test_features_match_pipeline_on_dataset(pipe, fast, donors):
+    records = donors[RAW_COLUMNS].astype(object).where(donors[RAW_COLUMNS].notna(), None).to_dict(orient="records")
+    scalar = np.array([fast.predict_proba_features(derive_record(r)) for r in records])
+    np.testing.assert_allclose(scalar, _pipeline_proba(pipe, records), rtol=0, atol=ATOL)
+
+
+def test_check_parity_on_dataset(pipe, fast, donors):
+    assert check_parity(pipe, fast, donors[RAW_COLUMNS], atol=ATOL) <= ATOL
+
+
+@pytest.mark.parametrize("record", EDGE_RECORDS)
+def test_features_match_pipeline_on_unknown_and_missing(pipe, fast, record):
+    expected = _pipeline_proba(pipe, [record])[0]
+    assert fast.predict_proba_features(derive_record(record)) == pytest.approx(expected, rel=0, abs=ATOL)
+    assert fast.predict_proba_record(record) == pytest.approx(expected, rel=0, abs=ATOL)
+
+
+def test_vectorized_matches_pipeline_on_unknown_and_missing(pipe, fast):
+    X = derive_features(EDGE_RECORDS)
+    np.testing.assert_allclose(fast.predict_proba(X)[:, 1], pipe.predict_proba(X)[:, 1], rtol=0, atol=ATOL)
+
+
+def test_saved_predictor_round_trips(pipe, fast, tmp_path):
+    path = tmp_path / "fast.npz"
+    fast.save(path)
+    loaded = FastPredictor.load(path)
+    X = derive_features(EDGE_RECORDS)
+    np.testing.assert_array_equal(loaded.predict_proba(X), fast.predict_proba(X))